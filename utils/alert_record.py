@@ -0,0 +1,545 @@
+#!/usr/bin/env python3
+"""
+Memory-compact GUIDE alert representation for in-process hot paths.
+
+A GUIDE row held as a pandas record or a plain dict of 45+ fields costs
+kilobytes, although most of those fields are either small-integer IDs or
+null (MitreTechniques 57%, ThreatFamily 99%, ActionGrouped 99%). This module
+provides:
+
+- ``AlertRecord``: a ``__slots__`` record with interned categorical codes
+  for Category, IncidentGrade, EntityType and EvidenceRole, packed integer
+  entity IDs and sparse storage for the mostly-null columns.
+- ``AlertBatch``: a columnar container over NumPy arrays for bulk work.
+- Conversion to and from the ``alert.ingestion`` event envelope
+  (``schemas/events/alert-ingestion-event.schema.json``). ``rawData`` is a
+  read-only view over the record rather than a copied dict, so a record
+  round-trips through the envelope without copying.
+"""
+
+import sys
+import uuid
+from array import array
+from collections.abc import Mapping
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+
+# Always-present integer columns stored directly in record slots.
+CORE_COLUMNS = ('Id', 'OrgId', 'IncidentId', 'AlertId', 'DetectorId', 'AlertTitle')
+
+# Low-cardinality string columns stored as interned integer codes.
+CATEGORICAL_COLUMNS = ('Category', 'IncidentGrade', 'EntityType', 'EvidenceRole')
+
+# Integer entity/attribute identifiers packed into one array per record.
+ENTITY_COLUMNS = (
+    'DeviceId', 'Sha256', 'IpAddress', 'Url', 'AccountSid', 'AccountUpn',
+    'AccountObjectId', 'AccountName', 'DeviceName', 'NetworkMessageId',
+    'RegistryKey', 'RegistryValueName', 'RegistryValueData', 'ApplicationId',
+    'ApplicationName', 'OAuthApplicationId', 'FileName', 'FolderPath',
+    'ResourceIdName', 'OSFamily', 'OSVersion', 'CountryCode', 'State', 'City',
+)
+
+# Mostly-null columns; only non-null values are stored.
+SPARSE_COLUMNS = (
+    'MitreTechniques', 'ActionGrouped', 'ActionGranular', 'EmailClusterId',
+    'ThreatFamily', 'ResourceType', 'Roles', 'AntispamDirection',
+    'SuspicionLevel', 'LastVerdict',
+)
+
+# Column order of the raw GUIDE CSV files.
+GUIDE_COLUMNS = (
+    'Id', 'OrgId', 'IncidentId', 'AlertId', 'Timestamp', 'DetectorId',
+    'AlertTitle', 'Category', 'MitreTechniques', 'IncidentGrade',
+    'ActionGrouped', 'ActionGranular', 'EntityType', 'EvidenceRole',
+    'DeviceId', 'Sha256', 'IpAddress', 'Url', 'AccountSid', 'AccountUpn',
+    'AccountObjectId', 'AccountName', 'DeviceName', 'NetworkMessageId',
+    'EmailClusterId', 'RegistryKey', 'RegistryValueName', 'RegistryValueData',
+    'ApplicationId', 'ApplicationName', 'OAuthApplicationId', 'ThreatFamily',
+    'FileName', 'FolderPath', 'ResourceIdName', 'ResourceType', 'Roles',
+    'OSFamily', 'OSVersion', 'AntispamDirection', 'SuspicionLevel',
+    'LastVerdict', 'CountryCode', 'State', 'City',
+)
+
+NULL_CODE = -1
+
+# Severity inference from implementation-guidance.md (IncidentGrade + Category).
+CATEGORY_SEVERITY_MAP = {
+    'InitialAccess': 'High',
+    'Exfiltration': 'High',
+    'Impact': 'High',
+    'CommandAndControl': 'Medium',
+    'CredentialAccess': 'Medium',
+    'Execution': 'Medium',
+}
+
+# GUIDE EntityType -> triage input schema entity type and identifying column.
+ENTITY_TYPE_MAP = {
+    'User': ('user', 'AccountUpn'),
+    'Mailbox': ('email', 'AccountUpn'),
+    'Machine': ('host', 'DeviceName'),
+    'Ip': ('ip', 'IpAddress'),
+    'Url': ('url', 'Url'),
+    'File': ('file', 'Sha256'),
+    'Process': ('process', 'FileName'),
+    'RegistryKey': ('registry', 'RegistryKey'),
+    'RegistryValue': ('registry', 'RegistryValueName'),
+    'MailMessage': ('email', 'NetworkMessageId'),
+}
+
+
+def _is_null(value: Any) -> bool:
+    """Return True for None, NaN and empty strings."""
+    return value is None or value != value or value == ''
+
+
+def _to_int(value: Any) -> int:
+    """Convert a GUIDE identifier (str, float or int) to int, mapping nulls to 0."""
+    if _is_null(value):
+        return 0
+    if isinstance(value, str):
+        return int(float(value)) if '.' in value else int(value)
+    return int(value)
+
+
+class CategoryCodec:
+    """Interning string <-> small-integer code table for one categorical column."""
+
+    __slots__ = ('name', '_codes', '_values')
+
+    def __init__(self, name: str, values: Iterable[str] = ()):
+        self.name = name
+        self._codes: Dict[str, int] = {}
+        self._values: List[str] = []
+        for value in values:
+            self.encode(value)
+
+    def encode(self, value: Any) -> int:
+        """Return the code for ``value``, assigning a new one if unseen."""
+        if _is_null(value):
+            return NULL_CODE
+        code = self._codes.get(value)
+        if code is None:
+            value = sys.intern(str(value))
+            code = len(self._values)
+            self._codes[value] = code
+            self._values.append(value)
+        return code
+
+    def decode(self, code: int) -> Optional[str]:
+        """Return the interned string for ``code`` (None for the null code)."""
+        if code == NULL_CODE:
+            return None
+        return self._values[code]
+
+    @property
+    def values(self) -> List[str]:
+        return list(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+
+# Shared codecs, pre-seeded with the values observed in the GUIDE sample so
+# codes are stable across processes for the common cases.
+CODECS = {
+    'Category': CategoryCodec('Category', (
+        'InitialAccess', 'Exfiltration', 'SuspiciousActivity', 'CommandAndControl',
+        'Impact', 'CredentialAccess', 'Execution', 'Malware', 'Discovery',
+        'Persistence', 'DefenseEvasion', 'LateralMovement', 'PrivilegeEscalation',
+        'Collection', 'Ransomware', 'UnwantedSoftware', 'Exploit',
+        'CredentialStealing', 'WebExploit', 'Weaponization',
+    )),
+    'IncidentGrade': CategoryCodec('IncidentGrade', (
+        'BenignPositive', 'TruePositive', 'FalsePositive',
+    )),
+    'EntityType': CategoryCodec('EntityType', (
+        'Ip', 'User', 'MailMessage', 'Machine', 'File', 'Url', 'Mailbox',
+        'CloudLogonRequest', 'Process', 'CloudApplication', 'MailCluster',
+        'RegistryValue', 'AzureResource', 'RegistryKey', 'OAuthApplication',
+        'SecurityGroup', 'CloudLogonSession', 'Malware', 'ActiveDirectoryDomain',
+        'IoTDevice', 'BlobContainer', 'Blob', 'Nic', 'GenericEntity',
+        'AmazonResource', 'KubernetesCluster', 'KubernetesPod', 'KubernetesNamespace',
+    )),
+    'EvidenceRole': CategoryCodec('EvidenceRole', ('Related', 'Impacted')),
+}
+
+
+def parse_timestamp(value: Any) -> int:
+    """Convert a GUIDE timestamp (ISO string, datetime or epoch) to epoch seconds."""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, float):
+        return int(value)
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        dt = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def format_timestamp(epoch: int) -> str:
+    """Format epoch seconds as the ISO 8601 form used by the event schemas."""
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def infer_severity(incident_grade: Optional[str], category: Optional[str]) -> str:
+    """Infer a preliminary severity from IncidentGrade and Category."""
+    if incident_grade == 'TruePositive':
+        return CATEGORY_SEVERITY_MAP.get(category, 'Medium')
+    if incident_grade == 'FalsePositive':
+        return 'Low'
+    return 'Informational'
+
+
+def encode_categorical(series, column: str) -> np.ndarray:
+    """Vectorised ``CODECS[column].encode`` over a pandas Series (int16 codes)."""
+    codec = CODECS[column]
+    uniques, inverse = np.unique(series.fillna('').to_numpy(dtype=object), return_inverse=True)
+    lookup = np.array([codec.encode(u) for u in uniques], dtype=np.int16)
+    return lookup[inverse]
+
+
+class AlertRecord:
+    """
+    Compact, slot-based representation of a single GUIDE evidence row.
+
+    Categorical strings are stored as codes into the shared ``CODECS``;
+    entity identifiers live in one packed ``array('q')``; mostly-null
+    columns are kept in a small dict that is None when every one is null.
+    """
+
+    __slots__ = (
+        'id', 'org_id', 'incident_id', 'alert_id', 'timestamp', 'detector_id',
+        'alert_title', 'category_code', 'grade_code', 'entity_type_code',
+        'evidence_role_code', 'entity_ids', 'sparse',
+    )
+
+    def __init__(self, id: int, org_id: int, incident_id: int, alert_id: int,
+                 timestamp: int, detector_id: int, alert_title: int,
+                 category_code: int = NULL_CODE, grade_code: int = NULL_CODE,
+                 entity_type_code: int = NULL_CODE, evidence_role_code: int = NULL_CODE,
+                 entity_ids: Optional[array] = None, sparse: Optional[Dict[str, Any]] = None):
+        self.id = id
+        self.org_id = org_id
+        self.incident_id = incident_id
+        self.alert_id = alert_id
+        self.timestamp = timestamp
+        self.detector_id = detector_id
+        self.alert_title = alert_title
+        self.category_code = category_code
+        self.grade_code = grade_code
+        self.entity_type_code = entity_type_code
+        self.evidence_role_code = evidence_role_code
+        self.entity_ids = entity_ids if entity_ids is not None else array('q', [0] * len(ENTITY_COLUMNS))
+        self.sparse = sparse or None
+
+    @classmethod
+    def from_row(cls, row: Mapping) -> 'AlertRecord':
+        """Build a record from a GUIDE row (csv.DictReader row, dict or pandas Series)."""
+        sparse = None
+        for col in SPARSE_COLUMNS:
+            value = row.get(col)
+            if not _is_null(value):
+                if sparse is None:
+                    sparse = {}
+                sparse[col] = sys.intern(value) if isinstance(value, str) else value
+
+        return cls(
+            id=_to_int(row['Id']),
+            org_id=_to_int(row['OrgId']),
+            incident_id=_to_int(row['IncidentId']),
+            alert_id=_to_int(row['AlertId']),
+            timestamp=parse_timestamp(row['Timestamp']),
+            detector_id=_to_int(row['DetectorId']),
+            alert_title=_to_int(row['AlertTitle']),
+            category_code=CODECS['Category'].encode(row.get('Category')),
+            grade_code=CODECS['IncidentGrade'].encode(row.get('IncidentGrade')),
+            entity_type_code=CODECS['EntityType'].encode(row.get('EntityType')),
+            evidence_role_code=CODECS['EvidenceRole'].encode(row.get('EvidenceRole')),
+            entity_ids=array('q', (_to_int(row.get(col)) for col in ENTITY_COLUMNS)),
+            sparse=sparse,
+        )
+
+    @property
+    def category(self) -> Optional[str]:
+        return CODECS['Category'].decode(self.category_code)
+
+    @property
+    def incident_grade(self) -> Optional[str]:
+        return CODECS['IncidentGrade'].decode(self.grade_code)
+
+    @property
+    def entity_type(self) -> Optional[str]:
+        return CODECS['EntityType'].decode(self.entity_type_code)
+
+    @property
+    def evidence_role(self) -> Optional[str]:
+        return CODECS['EvidenceRole'].decode(self.evidence_role_code)
+
+    @property
+    def mitre_techniques(self) -> List[str]:
+        raw = self.get('MitreTechniques')
+        if not raw:
+            return []
+        return [t.strip() for t in raw.split(';') if t.strip()]
+
+    @property
+    def severity(self) -> str:
+        return infer_severity(self.incident_grade, self.category)
+
+    def get(self, column: str, default: Any = None) -> Any:
+        """Return the value of a GUIDE column by its original name."""
+        value = _column_getter(self, column)
+        return default if value is None else value
+
+    def to_row(self) -> Dict[str, Any]:
+        """Materialise a plain dict in GUIDE column order (copies; for export only)."""
+        return {col: self.get(col) for col in GUIDE_COLUMNS}
+
+    def entities(self) -> List[Dict[str, Any]]:
+        """Return the evidence entity in the triage input schema ``entities`` shape."""
+        entity_type = self.entity_type
+        schema_type, id_column = ENTITY_TYPE_MAP.get(entity_type, ('host', 'DeviceId'))
+        return [{
+            'type': schema_type,
+            'name': str(self.get(id_column)),
+            'properties': {
+                'guideEntityType': entity_type,
+                'evidenceRole': self.evidence_role,
+            },
+        }]
+
+    def to_event(self, event_id: Optional[str] = None,
+                 event_timestamp: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Wrap the record in an ``alert.ingestion`` event envelope.
+
+        ``alert.rawData`` is an ``AlertRowView`` over this record, not a copy;
+        pass it through ``dict()`` before JSON serialisation.
+        """
+        return {
+            'eventId': event_id or str(uuid.uuid4()),
+            'eventType': 'alert.ingestion',
+            'eventVersion': '1.0',
+            'eventTimestamp': event_timestamp or format_timestamp(int(datetime.now(timezone.utc).timestamp())),
+            'source': {'system': 'AgenticSOC', 'component': 'AlertIngestionService'},
+            'alert': {
+                'alertId': f"GUIDE_{self.alert_id}",
+                'source': 'Sentinel',
+                'severity': self.severity,
+                'entities': self.entities(),
+                'timestamp': format_timestamp(self.timestamp),
+                'correlationId': f"GUIDE_{self.incident_id}",
+                'tactics': [self.category] if self.category else [],
+                'techniques': self.mitre_techniques,
+                'rawData': AlertRowView(self),
+            },
+            'metadata': {'correlationId': f"GUIDE_{self.incident_id}"},
+        }
+
+    @classmethod
+    def from_event(cls, event: Mapping) -> 'AlertRecord':
+        """
+        Recover a record from an ``alert.ingestion`` envelope.
+
+        When ``rawData`` is an ``AlertRowView`` the original record is returned
+        as-is; otherwise ``rawData`` is parsed as a GUIDE row.
+        """
+        raw = event['alert']['rawData']
+        if isinstance(raw, AlertRowView):
+            return raw.record
+        return cls.from_row(raw)
+
+    def __eq__(self, other):
+        if not isinstance(other, AlertRecord):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def __repr__(self):
+        return (f"AlertRecord(id={self.id}, alert_id={self.alert_id}, "
+                f"category={self.category!r}, incident_grade={self.incident_grade!r}, "
+                f"entity_type={self.entity_type!r})")
+
+
+_ENTITY_INDEX = {col: i for i, col in enumerate(ENTITY_COLUMNS)}
+_CORE_ATTRS = {
+    'Id': 'id', 'OrgId': 'org_id', 'IncidentId': 'incident_id', 'AlertId': 'alert_id',
+    'DetectorId': 'detector_id', 'AlertTitle': 'alert_title',
+}
+_CATEGORICAL_ATTRS = {
+    'Category': 'category_code', 'IncidentGrade': 'grade_code',
+    'EntityType': 'entity_type_code', 'EvidenceRole': 'evidence_role_code',
+}
+
+
+def _column_getter(record: AlertRecord, column: str) -> Any:
+    """Look up a GUIDE column on a record without materialising the row."""
+    if column in _CORE_ATTRS:
+        return getattr(record, _CORE_ATTRS[column])
+    if column in _ENTITY_INDEX:
+        return record.entity_ids[_ENTITY_INDEX[column]]
+    if column in _CATEGORICAL_ATTRS:
+        return CODECS[column].decode(getattr(record, _CATEGORICAL_ATTRS[column]))
+    if column == 'Timestamp':
+        return format_timestamp(record.timestamp)
+    if column in SPARSE_COLUMNS:
+        return record.sparse.get(column) if record.sparse else None
+    raise KeyError(column)
+
+
+class AlertRowView(Mapping):
+    """Read-only GUIDE-row mapping backed by an ``AlertRecord`` (no copy)."""
+
+    __slots__ = ('record',)
+
+    def __init__(self, record: AlertRecord):
+        self.record = record
+
+    def __getitem__(self, column: str) -> Any:
+        return _column_getter(self.record, column)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(GUIDE_COLUMNS)
+
+    def __len__(self):
+        return len(GUIDE_COLUMNS)
+
+
+class AlertBatch:
+    """
+    Columnar container of GUIDE alerts over NumPy arrays.
+
+    Dense columns are int64 arrays, categorical columns are int16 codes into
+    the shared ``CODECS`` and each sparse column is a pair of (row index,
+    value) arrays holding only the non-null entries.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray],
+                 sparse: Optional[Dict[str, tuple]] = None):
+        self.columns = columns
+        self.sparse = sparse or {}
+        self._length = len(columns['Id'])
+
+    @classmethod
+    def from_records(cls, records: Iterable[AlertRecord]) -> 'AlertBatch':
+        """Build a batch from ``AlertRecord`` objects."""
+        records = list(records)
+        n = len(records)
+        columns = {}
+        for col, attr in _CORE_ATTRS.items():
+            columns[col] = np.fromiter((getattr(r, attr) for r in records), dtype=np.int64, count=n)
+        columns['Timestamp'] = np.fromiter((r.timestamp for r in records), dtype=np.int64, count=n)
+        for col, attr in _CATEGORICAL_ATTRS.items():
+            columns[col] = np.fromiter((getattr(r, attr) for r in records), dtype=np.int16, count=n)
+        entity_matrix = np.empty((n, len(ENTITY_COLUMNS)), dtype=np.int64)
+        for i, r in enumerate(records):
+            entity_matrix[i] = np.frombuffer(r.entity_ids, dtype=np.int64)
+        for j, col in enumerate(ENTITY_COLUMNS):
+            columns[col] = np.ascontiguousarray(entity_matrix[:, j])
+
+        sparse_rows: Dict[str, List[int]] = {col: [] for col in SPARSE_COLUMNS}
+        sparse_values: Dict[str, List[Any]] = {col: [] for col in SPARSE_COLUMNS}
+        for i, r in enumerate(records):
+            if r.sparse:
+                for col, value in r.sparse.items():
+                    sparse_rows[col].append(i)
+                    sparse_values[col].append(value)
+        sparse = {
+            col: (np.asarray(sparse_rows[col], dtype=np.int32),
+                  np.asarray(sparse_values[col], dtype=object))
+            for col in SPARSE_COLUMNS if sparse_rows[col]
+        }
+        return cls(columns, sparse)
+
+    @classmethod
+    def from_frame(cls, df) -> 'AlertBatch':
+        """Build a batch from a GUIDE pandas DataFrame."""
+        import pandas as pd
+
+        columns = {}
+        for col in CORE_COLUMNS:
+            columns[col] = df[col].to_numpy(dtype=np.int64)
+        timestamps = pd.to_datetime(df['Timestamp'], utc=True)
+        columns['Timestamp'] = (
+            (timestamps - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(seconds=1)
+        ).to_numpy(dtype=np.int64)
+        for col in CATEGORICAL_COLUMNS:
+            columns[col] = encode_categorical(df[col], col)
+        for col in ENTITY_COLUMNS:
+            columns[col] = df[col].fillna(0).to_numpy(dtype=np.int64) if col in df else np.zeros(len(df), dtype=np.int64)
+
+        sparse = {}
+        for col in SPARSE_COLUMNS:
+            if col not in df:
+                continue
+            mask = df[col].notna().to_numpy()
+            if mask.any():
+                values = df[col].to_numpy()[mask]
+                if values.dtype == object:
+                    values = np.array([sys.intern(v) if isinstance(v, str) else v for v in values], dtype=object)
+                sparse[col] = (np.flatnonzero(mask).astype(np.int32), values)
+        return cls(columns, sparse)
+
+    def __len__(self):
+        return self._length
+
+    def record(self, i: int) -> AlertRecord:
+        """Materialise row ``i`` as an ``AlertRecord``."""
+        c = self.columns
+        sparse = None
+        for col, (rows, values) in self.sparse.items():
+            pos = np.searchsorted(rows, i)
+            if pos < len(rows) and rows[pos] == i:
+                if sparse is None:
+                    sparse = {}
+                sparse[col] = values[pos]
+        return AlertRecord(
+            id=int(c['Id'][i]),
+            org_id=int(c['OrgId'][i]),
+            incident_id=int(c['IncidentId'][i]),
+            alert_id=int(c['AlertId'][i]),
+            timestamp=int(c['Timestamp'][i]),
+            detector_id=int(c['DetectorId'][i]),
+            alert_title=int(c['AlertTitle'][i]),
+            category_code=int(c['Category'][i]),
+            grade_code=int(c['IncidentGrade'][i]),
+            entity_type_code=int(c['EntityType'][i]),
+            evidence_role_code=int(c['EvidenceRole'][i]),
+            entity_ids=array('q', (int(c[col][i]) for col in ENTITY_COLUMNS)),
+            sparse=sparse,
+        )
+
+    def __getitem__(self, i: int) -> AlertRecord:
+        if i < 0:
+            i += self._length
+        if not 0 <= i < self._length:
+            raise IndexError(i)
+        return self.record(i)
+
+    def __iter__(self) -> Iterator[AlertRecord]:
+        for i in range(self._length):
+            yield self.record(i)
+
+    def decoded(self, column: str) -> np.ndarray:
+        """Return a categorical column as an object array of interned strings."""
+        codec = CODECS[column]
+        lookup = np.array(codec.values + [None], dtype=object)
+        return lookup[self.columns[column]]
+
+    def to_events(self) -> Iterator[Dict[str, Any]]:
+        """Yield ``alert.ingestion`` envelopes for every row in the batch."""
+        for record in self:
+            yield record.to_event()
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the batch's arrays (sparse values shallow)."""
+        total = sum(arr.nbytes for arr in self.columns.values())
+        for rows, values in self.sparse.values():
+            total += rows.nbytes + values.nbytes
+        return total
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Per-shard partial results for incremental GUIDE dataset analysis.
+
+Each GUIDE shard is reduced to a mergeable ``DatasetSummary`` (row count,
+dtypes, null counts, value counts of the low-cardinality columns the report
+reads, a HyperLogLog distinct-count sketch for every other column, the
+hourly histogram). Summaries are persisted in a cache directory keyed by
+the shard's SHA-256 content hash, so a rerun only reads shards that are new
+or changed and re-merges everything else from disk. A small stat index
+(size, mtime) avoids re-hashing unchanged files; results no longer
+referenced by any indexed shard are pruned.
+"""
+
+import hashlib
+import json
+import pickle
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+CACHE_VERSION = 3
+HASH_CHUNK_BYTES = 4 * 1024 * 1024
+
+# Low-cardinality columns whose distributions the report and charts read
+VALUE_COUNT_COLUMNS = ('IncidentGrade', 'Category', 'EntityType', 'MitreTechniques',
+                       'ThreatFamily', 'DetectorId')
+# High-cardinality columns that only need an exact distinct count
+DISTINCT_COLUMNS = ('IncidentId',)
+
+# HyperLogLog precision: 2**12 one-byte registers per column, ~1.6% standard error
+HLL_PRECISION = 12
+
+
+def file_sha256(path: Path) -> str:
+    """Return the hex SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _sum_counts(parts: List[pd.Series]) -> pd.Series:
+    """Sum value_counts-style Series in one pass (concat + groupby)."""
+    parts = [p for p in parts if p is not None and len(p) > 0]
+    if not parts:
+        return pd.Series(dtype='int64')
+    if len(parts) == 1:
+        return parts[0].copy()
+    return pd.concat(parts).groupby(level=0, sort=False).sum().astype('int64')
+
+
+def hll_registers(series: pd.Series, precision: int = HLL_PRECISION) -> np.ndarray:
+    """HyperLogLog registers of a column's non-null values."""
+    values = series.dropna()
+    if (values.dtype.kind == 'f' and len(values) and np.isfinite(values).all()
+            and (values == np.floor(values)).all()):
+        # A shard whose integer column has nulls is read as float; hash 3.0 like 3
+        values = values.astype('int64')
+    hashes = pd.util.hash_pandas_object(values, index=False).to_numpy(dtype=np.uint64)
+    registers = np.zeros(1 << precision, dtype=np.uint8)
+    if len(hashes) == 0:
+        return registers
+    index = (hashes >> np.uint64(64 - precision)).astype(np.intp)
+    rest = hashes << np.uint64(precision)
+    # Bit length from the float exponent; the top 53 bits convert exactly
+    _, exponent = np.frexp((rest >> np.uint64(11)).astype(np.float64))
+    rank = np.where(rest >> np.uint64(11) > 0, 64 - (exponent + 11) + 1, 64 - precision + 1)
+    np.maximum.at(registers, index, rank.astype(np.uint8))
+    return registers
+
+
+def hll_estimate(registers: np.ndarray) -> int:
+    """Distinct-count estimate from HyperLogLog registers (linear counting when sparse)."""
+    m = len(registers)
+    estimate = 0.7213 / (1 + 1.079 / m) * m * m / np.ldexp(1.0, -registers.astype(np.int64)).sum()
+    zeros = int((registers == 0).sum())
+    if estimate <= 2.5 * m and zeros:
+        estimate = m * np.log(m / zeros)
+    return int(round(estimate))
+
+
+class DatasetSummary:
+    """
+    Mergeable aggregates describing one or more GUIDE shards.
+
+    Full value counts are kept only for ``VALUE_COUNT_COLUMNS`` and exact
+    distinct IDs (a sorted unique array) only for ``DISTINCT_COLUMNS``;
+    every other column records its dtype, null count and HyperLogLog
+    registers, so the cache stays small next to the raw shards.
+    """
+
+    def __init__(self):
+        self.n_rows = 0
+        self.columns: List[str] = []
+        self.dtypes: Dict[str, str] = {}
+        self.dtype_observed: Dict[str, bool] = {}
+        self.null_counts: Dict[str, int] = {}
+        self.value_counts: Dict[str, pd.Series] = {}
+        self.distinct: Dict[str, np.ndarray] = {}
+        self.sketches: Dict[str, np.ndarray] = {}
+        self.timestamp_min = None
+        self.timestamp_max = None
+        self.hourly_counts = pd.Series(dtype='int64')
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'DatasetSummary':
+        """Reduce a DataFrame to its summary."""
+        summary = cls()
+        summary.n_rows = len(df)
+        summary.columns = list(df.columns)
+
+        for col in df.columns:
+            series = df[col]
+            null_count = int(series.isnull().sum())
+            summary.null_counts[col] = null_count
+            summary.dtypes[col] = str(series.dtype)
+            # An all-null column in one shard says nothing about the real type
+            summary.dtype_observed[col] = null_count < len(series)
+            if col in VALUE_COUNT_COLUMNS:
+                summary.value_counts[col] = series.value_counts()
+            elif col in DISTINCT_COLUMNS:
+                summary.distinct[col] = np.unique(series.dropna().to_numpy())
+            else:
+                summary.sketches[col] = hll_registers(series)
+
+        if 'Timestamp' in df.columns and len(df) > 0:
+            timestamps = pd.to_datetime(df['Timestamp'])
+            summary.timestamp_min = timestamps.min()
+            summary.timestamp_max = timestamps.max()
+            summary.hourly_counts = timestamps.dt.hour.value_counts().sort_index()
+
+        return summary
+
+    @classmethod
+    def merge_all(cls, summaries: Iterable['DatasetSummary']) -> 'DatasetSummary':
+        """Merge an iterable of summaries into a new one."""
+        merged = cls()
+        counts: Dict[str, List[pd.Series]] = {}
+        distinct: Dict[str, List[np.ndarray]] = {}
+        hourly = []
+        for summary in summaries:
+            merged.n_rows += summary.n_rows
+            for col in summary.columns:
+                if col not in merged.null_counts:
+                    merged.columns.append(col)
+                    merged.null_counts[col] = 0
+                    merged.dtypes[col] = summary.dtypes[col]
+                    merged.dtype_observed[col] = summary.dtype_observed[col]
+                elif summary.dtype_observed[col] and not merged.dtype_observed[col]:
+                    merged.dtypes[col] = summary.dtypes[col]
+                    merged.dtype_observed[col] = True
+                merged.null_counts[col] += summary.null_counts[col]
+                if col in summary.value_counts:
+                    counts.setdefault(col, []).append(summary.value_counts[col])
+                if col in summary.distinct:
+                    distinct.setdefault(col, []).append(summary.distinct[col])
+                if col in summary.sketches:
+                    if col in merged.sketches:
+                        np.maximum(merged.sketches[col], summary.sketches[col], out=merged.sketches[col])
+                    else:
+                        merged.sketches[col] = summary.sketches[col].copy()
+
+            if summary.timestamp_min is not None:
+                if merged.timestamp_min is None or summary.timestamp_min < merged.timestamp_min:
+                    merged.timestamp_min = summary.timestamp_min
+                if merged.timestamp_max is None or summary.timestamp_max > merged.timestamp_max:
+                    merged.timestamp_max = summary.timestamp_max
+            hourly.append(summary.hourly_counts)
+
+        for col, parts in counts.items():
+            merged.value_counts[col] = _sum_counts(parts).sort_values(ascending=False, kind='stable')
+        for col, parts in distinct.items():
+            merged.distinct[col] = parts[0] if len(parts) == 1 else np.unique(np.concatenate(parts))
+        merged.hourly_counts = _sum_counts(hourly).sort_index()
+        return merged
+
+    def has(self, col: str) -> bool:
+        return col in self.null_counts
+
+    def dtype(self, col: str) -> str:
+        return self.dtypes.get(col, 'object')
+
+    def nunique(self, col: str) -> Optional[int]:
+        """Distinct non-null values (estimated for sketched columns), or None if unknown."""
+        if col in self.value_counts:
+            return len(self.value_counts[col])
+        if col in self.distinct:
+            return len(self.distinct[col])
+        if col in self.sketches:
+            return hll_estimate(self.sketches[col])
+        return None
+
+    def nunique_exact(self, col: str) -> bool:
+        """True if ``nunique(col)`` is an exact count rather than a sketch estimate."""
+        return col in self.value_counts or col in self.distinct
+
+    def notna(self, col: str) -> int:
+        return self.n_rows - self.null_counts[col]
+
+    def null_pct(self) -> pd.Series:
+        """Percentage of nulls per column, in column order."""
+        counts = pd.Series(self.null_counts, dtype='float64').reindex(self.columns)
+        return counts / self.n_rows * 100 if self.n_rows else counts
+
+    def normalized(self, col: str) -> pd.Series:
+        """value_counts(normalize=True) * 100 equivalent (over non-null rows)."""
+        counts = self.value_counts[col]
+        return counts / counts.sum() * 100
+
+
+class ShardCache:
+    """On-disk store of per-shard ``DatasetSummary`` objects keyed by content hash."""
+
+    INDEX_FILE = 'index.json'
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._index_path = self.cache_dir / self.INDEX_FILE
+        self._index = self._load_index()
+
+    def _load_index(self) -> Dict[str, dict]:
+        if not self._index_path.exists():
+            return {}
+        try:
+            index = json.loads(self._index_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if index.get('version') != CACHE_VERSION:
+            return {}
+        return index.get('files', {})
+
+    def save_index(self):
+        """Persist the path -> (size, mtime, hash) index."""
+        payload = {'version': CACHE_VERSION, 'files': self._index}
+        self._index_path.write_text(json.dumps(payload, indent=2, sort_keys=True))
+
+    def content_hash(self, path: Path) -> str:
+        """Return the content hash, reusing the indexed value if the file is unchanged."""
+        stat = path.stat()
+        entry = self._index.get(str(path))
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry['sha256']
+        sha = file_sha256(path)
+        self._index[str(path)] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': sha}
+        return sha
+
+    def _entry_path(self, sha: str) -> Path:
+        return self.cache_dir / f"{sha}.pkl"
+
+    def get(self, sha: str) -> Optional[DatasetSummary]:
+        path = self._entry_path(sha)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'rb') as f:
+                version, summary = pickle.load(f)
+        except Exception:
+            # Unreadable or written by another pandas/class version: re-analyze
+            return None
+        return summary if version == CACHE_VERSION else None
+
+    def put(self, sha: str, summary: DatasetSummary):
+        path = self._entry_path(sha)
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'wb') as f:
+            pickle.dump((CACHE_VERSION, summary), f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(path)
+
+    def summarize(self, files: Iterable[Path]) -> Tuple[DatasetSummary, List[Path]]:
+        """
+        Return the merged summary of ``files`` and the list of shards that
+        had to be (re-)analyzed because no cached result matched their content.
+        """
+        summaries, analyzed = [], []
+        for file in files:
+            sha = self.content_hash(file)
+            summary = self.get(sha)
+            if summary is None:
+                print(f"  Analyzing {file.name}...")
+                summary = DatasetSummary.from_frame(pd.read_csv(file))
+                self.put(sha, summary)
+                analyzed.append(file)
+            else:
+                print(f"  Cached    {file.name}")
+            summaries.append(summary)
+        self.prune()
+        self.save_index()
+        return DatasetSummary.merge_all(summaries), analyzed
+
+    def prune(self):
+        """Forget shards that no longer exist and delete results no indexed shard references."""
+        self._index = {path: entry for path, entry in self._index.items() if Path(path).exists()}
+        referenced = {entry['sha256'] for entry in self._index.values()}
+        for path in self.cache_dir.glob('*.pkl'):
+            if path.stem not in referenced:
+                path.unlink(missing_ok=True)
@@ -4,47 +4,92 @@ Comprehensive analysis of the GUIDE mock dataset for Agentic SOC system.
 
 This script analyzes the Microsoft Security Incident Prediction dataset (GUIDE)
 stored in the mock-data directory and generates a comprehensive report.
+
+Only the report and charts are incremental: they are built from per-shard
+summaries cached by content hash. The console analyses (schema, data
+quality, key fields, temporal patterns) need row-level data and parse the
+first ``n_files`` shards on every run.
 """
 
 import os
 import sys
 import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from pathlib import Path
 from datetime import datetime
 import warnings
+
+from analysis_cache import DatasetSummary, ShardCache
+from charts import FULL_DPI, PREVIEW_DPI, build_chart_specs, render_charts
+from guide_paths import DEFAULT_DATA_DIR, DEFAULT_OUTPUT_DIR, DEFAULT_REPORT_FILE
+from instrumentation import PipelineMetrics, instrumented
+
 warnings.filterwarnings('ignore')
 
-# Set visualization style
-sns.set_style('whitegrid')
-plt.rcParams['figure.figsize'] = (14, 8)
+
+def _sample_rows(analyzer):
+    return len(analyzer.df_sample) if analyzer.df_sample is not None else 0
+
+
+def _summary_rows(analyzer):
+    return analyzer.summary.n_rows if analyzer.summary is not None else _sample_rows(analyzer)
+
 
 class GUIDEDatasetAnalyzer:
     """Analyzer for GUIDE dataset."""
     
-    def __init__(self, data_dir: str):
+    def __init__(self, data_dir: str, metrics: PipelineMetrics = None):
+        self.metrics = metrics if metrics is not None else PipelineMetrics('guide-analysis')
         self.data_dir = Path(data_dir)
         self.train_files = sorted(list(self.data_dir.glob('GUIDE_Train_*.csv')))
         self.test_files = sorted(list(self.data_dir.glob('GUIDE_Test_*.csv')))
         self.df_sample = None
         self.df_full_sample = None
+        self.summary = None
         
-    def load_sample_data(self, n_files: int = 3):
-        """Load a sample of the dataset for initial exploration."""
+    @instrumented('load_sample', rows=_sample_rows)
+    def load_sample_data(self, n_files: int = 3, columns: list = None):
+        """Load a sample of the dataset for initial exploration.
+        
+        ``columns`` restricts parsing to the named columns.
+        """
         print(f"Loading sample data from {n_files} training files...")
         
         dfs = []
         for file in self.train_files[:n_files]:
             print(f"  Loading {file.name}...")
-            df = pd.read_csv(file)
+            df = pd.read_csv(file, usecols=columns)
+            self.metrics.add_bytes(file.stat().st_size)
             dfs.append(df)
         
         self.df_sample = pd.concat(dfs, ignore_index=True)
+        self.summary = None
         print(f"Sample loaded: {len(self.df_sample):,} records from {n_files} files\n")
         return self.df_sample
     
+    @instrumented('load_incremental', rows=_summary_rows)
+    def load_incremental(self, cache_dir: str, n_files: int = None):
+        """Summarize training shards, reusing cached per-shard results.
+        
+        Only shards whose content hash has no cached result are read; the
+        rest are merged from ``cache_dir``.
+        """
+        files = self.train_files if n_files is None else self.train_files[:n_files]
+        print(f"Summarizing {len(files)} training files (cache: {cache_dir})...")
+        
+        cache = ShardCache(cache_dir)
+        self.summary, analyzed = cache.summarize(files)
+        self.metrics.add_bytes(sum(f.stat().st_size for f in analyzed))
+        print(f"Summary ready: {self.summary.n_rows:,} records, "
+              f"{len(analyzed)} of {len(files)} files analyzed\n")
+        return self.summary
+    
+    def get_summary(self):
+        """Return the dataset summary, deriving it from the loaded sample if needed."""
+        if self.summary is None:
+            self.summary = DatasetSummary.from_frame(self.df_sample)
+        return self.summary
+    
+    @instrumented('basic_info', rows=_sample_rows)
     def get_basic_info(self):
         """Get basic information about the dataset."""
         print("=" * 80)
@@ -72,6 +117,7 @@ class GUIDEDatasetAnalyzer:
             'total_columns': self.df_sample.shape[1]
         }
     
+    @instrumented('schema', rows=_sample_rows)
     def analyze_schema(self):
         """Analyze and document the schema."""
         print("\n" + "=" * 80)
@@ -114,6 +160,7 @@ class GUIDEDatasetAnalyzer:
         
         return pd.DataFrame(schema_info)
     
+    @instrumented('quality', rows=_sample_rows)
     def analyze_data_quality(self):
         """Analyze data quality metrics."""
         print("\n" + "=" * 80)
@@ -144,6 +191,7 @@ class GUIDEDatasetAnalyzer:
         
         return missing_df
     
+    @instrumented('key_fields', rows=_sample_rows)
     def analyze_key_fields(self):
         """Analyze key fields relevant to SOC operations."""
         print("\n" + "=" * 80)
@@ -211,6 +259,7 @@ class GUIDEDatasetAnalyzer:
         
         return analyses
     
+    @instrumented('temporal', rows=_sample_rows)
     def analyze_temporal_patterns(self):
         """Analyze temporal patterns in the data."""
         print("\n" + "=" * 80)
@@ -249,94 +298,36 @@ class GUIDEDatasetAnalyzer:
             'daily_counts': daily_counts
         }
     
-    def generate_visualizations(self, output_dir: str):
-        """Generate key visualizations."""
+    @instrumented('visualization', rows=_summary_rows)
+    def generate_visualizations(self, output_dir: str, preview: bool = False, workers: int = None):
+        """Generate key visualizations.
+        
+        Charts are rendered from the summary's aggregate tables (see
+        ``charts.render_charts`` for when worker processes are used).
+        ``preview`` renders at low dpi for quick iteration.
+        """
         print("\n" + "=" * 80)
         print("GENERATING VISUALIZATIONS")
         print("=" * 80)
         
+        summary = self.get_summary()
         output_path = Path(output_dir)
-        output_path.mkdir(parents=True, exist_ok=True)
+        dpi = PREVIEW_DPI if preview else FULL_DPI
         
-        # 1. Incident Grade Distribution
-        if 'IncidentGrade' in self.df_sample.columns:
-            plt.figure(figsize=(10, 6))
-            grade_counts = self.df_sample['IncidentGrade'].value_counts()
-            plt.bar(grade_counts.index, grade_counts.values)
-            plt.title('Incident Grade Distribution', fontsize=14, fontweight='bold')
-            plt.xlabel('Incident Grade')
-            plt.ylabel('Count')
-            plt.xticks(rotation=45, ha='right')
-            plt.tight_layout()
-            plt.savefig(output_path / 'incident_grade_distribution.png', dpi=300, bbox_inches='tight')
-            plt.close()
-            print(f"  ✓ Saved: incident_grade_distribution.png")
-        
-        # 2. Top Categories
-        if 'Category' in self.df_sample.columns:
-            plt.figure(figsize=(12, 6))
-            top_categories = self.df_sample['Category'].value_counts().head(10)
-            plt.barh(range(len(top_categories)), top_categories.values)
-            plt.yticks(range(len(top_categories)), top_categories.index)
-            plt.xlabel('Count')
-            plt.title('Top 10 Attack Categories', fontsize=14, fontweight='bold')
-            plt.tight_layout()
-            plt.savefig(output_path / 'top_categories.png', dpi=300, bbox_inches='tight')
-            plt.close()
-            print(f"  ✓ Saved: top_categories.png")
-        
-        # 3. Entity Type Distribution
-        if 'EntityType' in self.df_sample.columns:
-            plt.figure(figsize=(10, 6))
-            entity_counts = self.df_sample['EntityType'].value_counts()
-            plt.bar(range(len(entity_counts)), entity_counts.values)
-            plt.xticks(range(len(entity_counts)), entity_counts.index, rotation=45, ha='right')
-            plt.title('Entity Type Distribution', fontsize=14, fontweight='bold')
-            plt.xlabel('Entity Type')
-            plt.ylabel('Count')
-            plt.tight_layout()
-            plt.savefig(output_path / 'entity_type_distribution.png', dpi=300, bbox_inches='tight')
-            plt.close()
-            print(f"  ✓ Saved: entity_type_distribution.png")
-        
-        # 4. Temporal pattern - hourly
-        if 'Hour' in self.df_sample.columns:
-            plt.figure(figsize=(12, 6))
-            hourly = self.df_sample['Hour'].value_counts().sort_index()
-            plt.plot(hourly.index, hourly.values, marker='o', linewidth=2)
-            plt.title('Alert Volume by Hour of Day', fontsize=14, fontweight='bold')
-            plt.xlabel('Hour of Day')
-            plt.ylabel('Number of Alerts')
-            plt.grid(True, alpha=0.3)
-            plt.tight_layout()
-            plt.savefig(output_path / 'hourly_pattern.png', dpi=300, bbox_inches='tight')
-            plt.close()
-            print(f"  ✓ Saved: hourly_pattern.png")
-        
-        # 5. Missing data heatmap
-        plt.figure(figsize=(12, 8))
-        missing_matrix = self.df_sample.isnull()
-        missing_pct = missing_matrix.sum() / len(self.df_sample) * 100
-        missing_pct = missing_pct[missing_pct > 0].sort_values(ascending=False)
-        
-        if len(missing_pct) > 0:
-            plt.barh(range(len(missing_pct)), missing_pct.values)
-            plt.yticks(range(len(missing_pct)), missing_pct.index)
-            plt.xlabel('Missing Percentage (%)')
-            plt.title('Data Completeness by Column', fontsize=14, fontweight='bold')
-            plt.tight_layout()
-            plt.savefig(output_path / 'data_completeness.png', dpi=300, bbox_inches='tight')
-            plt.close()
-            print(f"  ✓ Saved: data_completeness.png")
+        specs = build_chart_specs(summary)
+        for filename in render_charts(specs, output_path, dpi=dpi, workers=workers):
+            print(f"  ✓ Saved: {filename}")
         
         print(f"\nAll visualizations saved to: {output_path}")
     
+    @instrumented('insights', rows=_summary_rows)
     def generate_insights(self):
         """Generate insights for Agentic SOC implementation."""
         print("\n" + "=" * 80)
         print("INSIGHTS FOR AGENTIC SOC IMPLEMENTATION")
         print("=" * 80)
         
+        summary = self.get_summary()
         insights = []
         
         # 1. Alert Triage Agent Insights
@@ -345,8 +336,8 @@ class GUIDEDatasetAnalyzer:
             'insights': []
         })
         
-        if 'IncidentGrade' in self.df_sample.columns:
-            grade_dist = self.df_sample['IncidentGrade'].value_counts(normalize=True) * 100
+        if summary.has('IncidentGrade'):
+            grade_dist = summary.normalized('IncidentGrade')
             if 'TruePositive' in grade_dist.index:
                 tp_pct = grade_dist['TruePositive']
                 insights[-1]['insights'].append(
@@ -364,15 +355,15 @@ class GUIDEDatasetAnalyzer:
             'insights': []
         })
         
-        if 'EntityType' in self.df_sample.columns:
-            entity_count = self.df_sample['EntityType'].nunique()
+        if summary.has('EntityType'):
+            entity_count = summary.nunique('EntityType')
             insights[-1]['insights'].append(
                 f"Dataset includes {entity_count} entity types - enables comprehensive hunting across multiple dimensions"
             )
         
-        if 'MitreTechniques' in self.df_sample.columns:
-            mitre_coverage = self.df_sample['MitreTechniques'].notna().sum() / len(self.df_sample) * 100
-            unique_techniques = self.df_sample['MitreTechniques'].nunique()
+        if summary.has('MitreTechniques'):
+            mitre_coverage = summary.notna('MitreTechniques') / summary.n_rows * 100
+            unique_techniques = summary.nunique('MitreTechniques')
             insights[-1]['insights'].append(
                 f"{mitre_coverage:.1f}% of records have MITRE ATT&CK mappings ({unique_techniques} unique techniques) - excellent for technique-based hunting"
             )
@@ -383,13 +374,13 @@ class GUIDEDatasetAnalyzer:
             'insights': []
         })
         
-        if 'ActionGrouped' in self.df_sample.columns or 'ActionGranular' in self.df_sample.columns:
+        if summary.has('ActionGrouped') or summary.has('ActionGranular'):
             insights[-1]['insights'].append(
                 "Dataset includes Action columns - can be used to train/test automated response playbooks"
             )
         
-        if 'Category' in self.df_sample.columns:
-            category_count = self.df_sample['Category'].nunique()
+        if summary.has('Category'):
+            category_count = summary.nunique('Category')
             insights[-1]['insights'].append(
                 f"{category_count} unique attack categories - enables category-specific response playbooks"
             )
@@ -400,14 +391,14 @@ class GUIDEDatasetAnalyzer:
             'insights': []
         })
         
-        if 'ThreatFamily' in self.df_sample.columns:
-            threat_families = self.df_sample['ThreatFamily'].notna().sum()
+        if summary.has('ThreatFamily'):
+            threat_families = summary.notna('ThreatFamily')
             insights[-1]['insights'].append(
                 f"{threat_families:,} records have ThreatFamily indicators - useful for threat intelligence enrichment"
             )
         
-        if 'DetectorId' in self.df_sample.columns:
-            detector_count = self.df_sample['DetectorId'].nunique()
+        if summary.has('DetectorId'):
+            detector_count = summary.nunique('DetectorId')
             insights[-1]['insights'].append(
                 f"{detector_count} unique detector sources - demonstrates multi-source intelligence integration"
             )
@@ -420,12 +411,14 @@ class GUIDEDatasetAnalyzer:
         
         return insights
     
+    @instrumented('report', rows=_summary_rows)
     def generate_report(self, output_file: str):
         """Generate comprehensive markdown report."""
         print("\n" + "=" * 80)
         print("GENERATING COMPREHENSIVE REPORT")
         print("=" * 80)
         
+        summary = self.get_summary()
         report = []
         
         # Header
@@ -449,8 +442,8 @@ class GUIDEDatasetAnalyzer:
         
         total_size = sum(f.stat().st_size for f in self.train_files + self.test_files)
         report.append(f"- **Total Size**: {total_size / (1024**3):.2f} GB")
-        report.append(f"- **Sample Records Analyzed**: {len(self.df_sample):,}")
-        report.append(f"- **Total Columns**: {self.df_sample.shape[1]}")
+        report.append(f"- **Sample Records Analyzed**: {summary.n_rows:,}")
+        report.append(f"- **Total Columns**: {len(summary.columns)}")
         report.append("")
         
         # Schema Section
@@ -461,10 +454,10 @@ class GUIDEDatasetAnalyzer:
         report.append("| Column Name | Data Type | Null % | Unique Values | Description |")
         report.append("|-------------|-----------|--------|---------------|-------------|")
         
-        for col in self.df_sample.columns:
-            dtype = str(self.df_sample[col].dtype)
-            null_pct = (self.df_sample[col].isnull().sum() / len(self.df_sample)) * 100
-            unique_count = self.df_sample[col].nunique()
+        for col in summary.columns:
+            dtype = summary.dtype(col)
+            null_pct = (summary.null_counts[col] / summary.n_rows) * 100
+            unique_count = summary.nunique(col)
             
             # Infer description based on column name
             descriptions = {
@@ -498,16 +491,22 @@ class GUIDEDatasetAnalyzer:
             
             desc = descriptions.get(col, 'Evidence attribute')
             
-            report.append(f"| {col} | {dtype} | {null_pct:.1f}% | {unique_count:,} | {desc} |")
+            if unique_count is None:
+                unique_str = "-"
+            else:
+                unique_str = f"{unique_count:,}" if summary.nunique_exact(col) else f"~{unique_count:,}"
+            report.append(f"| {col} | {dtype} | {null_pct:.1f}% | {unique_str} | {desc} |")
         
         report.append("")
+        report.append("*~ marks HyperLogLog estimates (about 1.6% standard error).*")
+        report.append("")
         
         # Data Quality
         report.append("## Data Quality Assessment")
         report.append("")
         
-        missing_df = self.df_sample.isnull().sum()
-        missing_pct = (missing_df / len(self.df_sample) * 100).round(2)
+        missing_df = pd.Series(summary.null_counts).reindex(summary.columns)
+        missing_pct = summary.null_pct().round(2)
         
         report.append("### Completeness")
         report.append("")
@@ -523,41 +522,40 @@ class GUIDEDatasetAnalyzer:
         report.append("## Key Statistics")
         report.append("")
         
-        if 'IncidentGrade' in self.df_sample.columns:
+        if summary.has('IncidentGrade'):
             report.append("### Incident Grade Distribution")
             report.append("")
-            grade_dist = self.df_sample['IncidentGrade'].value_counts()
-            grade_pct = (grade_dist / len(self.df_sample) * 100).round(2)
+            grade_dist = summary.value_counts['IncidentGrade']
+            grade_pct = (grade_dist / summary.n_rows * 100).round(2)
             
             for grade, count in grade_dist.items():
                 report.append(f"- **{grade}**: {count:,} ({grade_pct[grade]:.2f}%)")
             report.append("")
         
-        if 'Category' in self.df_sample.columns:
+        if summary.has('Category'):
             report.append("### Top 10 Attack Categories")
             report.append("")
-            top_cats = self.df_sample['Category'].value_counts().head(10)
+            top_cats = summary.value_counts['Category'].head(10)
             for cat, count in top_cats.items():
                 report.append(f"- **{cat}**: {count:,}")
             report.append("")
         
-        if 'MitreTechniques' in self.df_sample.columns:
-            mitre_count = self.df_sample['MitreTechniques'].notna().sum()
-            mitre_pct = (mitre_count / len(self.df_sample) * 100)
-            unique_techniques = self.df_sample['MitreTechniques'].nunique()
+        if summary.has('MitreTechniques'):
+            mitre_count = summary.notna('MitreTechniques')
+            mitre_pct = (mitre_count / summary.n_rows * 100)
+            unique_techniques = summary.nunique('MitreTechniques')
             report.append("### MITRE ATT&CK Coverage")
             report.append("")
             report.append(f"- Records with MITRE techniques: {mitre_count:,} ({mitre_pct:.1f}%)")
             report.append(f"- Unique techniques: {unique_techniques}")
             report.append("")
         
-        if 'Timestamp' in self.df_sample.columns:
+        if summary.timestamp_min is not None:
             report.append("### Temporal Coverage")
             report.append("")
-            timestamps = pd.to_datetime(self.df_sample['Timestamp'])
-            report.append(f"- **Start Date**: {timestamps.min()}")
-            report.append(f"- **End Date**: {timestamps.max()}")
-            report.append(f"- **Duration**: {timestamps.max() - timestamps.min()}")
+            report.append(f"- **Start Date**: {summary.timestamp_min}")
+            report.append(f"- **End Date**: {summary.timestamp_max}")
+            report.append(f"- **Duration**: {summary.timestamp_max - summary.timestamp_min}")
             report.append("")
         
         # Insights for Agentic SOC
@@ -570,8 +568,8 @@ class GUIDEDatasetAnalyzer:
         report.append("**Key Capabilities Enabled by Dataset:**")
         report.append("")
         
-        if 'IncidentGrade' in self.df_sample.columns:
-            grade_dist = self.df_sample['IncidentGrade'].value_counts(normalize=True) * 100
+        if summary.has('IncidentGrade'):
+            grade_dist = summary.normalized('IncidentGrade')
             if 'TruePositive' in grade_dist.index:
                 tp_pct = grade_dist['TruePositive']
                 report.append(f"- **Ground Truth Labels**: Dataset includes incident grades with {tp_pct:.1f}% TruePositive alerts, enabling supervised learning for triage")
@@ -579,9 +577,9 @@ class GUIDEDatasetAnalyzer:
                 fp_pct = grade_dist['FalsePositive']
                 report.append(f"- **False Positive Filtering**: {fp_pct:.1f}% labeled FalsePositive - perfect for training FP detection models")
         
-        if 'IncidentId' in self.df_sample.columns:
-            incidents = self.df_sample['IncidentId'].nunique()
-            alerts_per_incident = len(self.df_sample) / incidents
+        if summary.has('IncidentId'):
+            incidents = summary.nunique('IncidentId')
+            alerts_per_incident = summary.n_rows / incidents
             report.append(f"- **Alert Correlation**: {incidents:,} unique incidents across sample - average {alerts_per_incident:.1f} alerts per incident")
         
         report.append("- **Priority Scoring**: Rich metadata (category, MITRE techniques, entity types) enables risk-based prioritization")
@@ -593,16 +591,16 @@ class GUIDEDatasetAnalyzer:
         report.append("**Key Capabilities Enabled by Dataset:**")
         report.append("")
         
-        if 'EntityType' in self.df_sample.columns:
-            entity_count = self.df_sample['EntityType'].nunique()
-            entity_types = self.df_sample['EntityType'].value_counts()
+        if summary.has('EntityType'):
+            entity_count = summary.nunique('EntityType')
+            entity_types = summary.value_counts['EntityType']
             report.append(f"- **Multi-Entity Hunting**: {entity_count} entity types available:")
             for entity, count in entity_types.items():
                 report.append(f"  - {entity}: {count:,}")
         
-        if 'MitreTechniques' in self.df_sample.columns:
-            mitre_coverage = self.df_sample['MitreTechniques'].notna().sum() / len(self.df_sample) * 100
-            unique_techniques = self.df_sample['MitreTechniques'].nunique()
+        if summary.has('MitreTechniques'):
+            mitre_coverage = summary.notna('MitreTechniques') / summary.n_rows * 100
+            unique_techniques = summary.nunique('MitreTechniques')
             report.append(f"- **MITRE ATT&CK Mapping**: {mitre_coverage:.1f}% coverage with {unique_techniques} unique techniques - enables technique-based hunting queries")
         
         report.append("- **Pivoting Capabilities**: Dataset links devices, accounts, IPs, URLs, files - enables lateral investigation")
@@ -614,14 +612,14 @@ class GUIDEDatasetAnalyzer:
         report.append("**Key Capabilities Enabled by Dataset:**")
         report.append("")
         
-        if 'ActionGrouped' in self.df_sample.columns or 'ActionGranular' in self.df_sample.columns:
+        if summary.has('ActionGrouped') or summary.has('ActionGranular'):
             report.append("- **Response Playbooks**: Action columns provide examples of customer remediation actions for training")
         
-        if 'Category' in self.df_sample.columns:
-            category_count = self.df_sample['Category'].nunique()
+        if summary.has('Category'):
+            category_count = summary.nunique('Category')
             report.append(f"- **Category-Specific Responses**: {category_count} unique categories enable tailored response playbooks")
         
-        if 'EntityType' in self.df_sample.columns:
+        if summary.has('EntityType'):
             report.append("- **Entity-Based Actions**: Multiple entity types (User, Device, IP, File, URL) enable targeted containment")
         
         report.append("- **Incident Context**: Full incident history enables context-aware response decisions")
@@ -633,13 +631,13 @@ class GUIDEDatasetAnalyzer:
         report.append("**Key Capabilities Enabled by Dataset:**")
         report.append("")
         
-        if 'ThreatFamily' in self.df_sample.columns:
-            threat_count = self.df_sample['ThreatFamily'].notna().sum()
-            unique_families = self.df_sample['ThreatFamily'].nunique()
+        if summary.has('ThreatFamily'):
+            threat_count = summary.notna('ThreatFamily')
+            unique_families = summary.nunique('ThreatFamily')
             report.append(f"- **Threat Intelligence**: {threat_count:,} records with threat family indicators ({unique_families} unique families)")
         
-        if 'DetectorId' in self.df_sample.columns:
-            detector_count = self.df_sample['DetectorId'].nunique()
+        if summary.has('DetectorId'):
+            detector_count = summary.nunique('DetectorId')
             report.append(f"- **Multi-Source Intelligence**: {detector_count} unique detector sources demonstrate integration complexity")
         
         report.append("- **IOC Extraction**: Dataset contains IPs, URLs, file hashes, domains - enables IOC enrichment workflows")
@@ -766,21 +764,35 @@ class GUIDEDatasetAnalyzer:
         
         print(f"\n✓ Report saved to: {output_file}")
         return report_text
+    
+    def write_metrics(self, report_file: str):
+        """Write stage metrics as JSON next to the report and print a summary."""
+        metrics_file = Path(report_file).with_suffix('.metrics.json')
+        self.metrics.write_json(metrics_file)
+        self.metrics.print_summary()
+        print(f"\n✓ Metrics saved to: {metrics_file}")
+        return metrics_file
 
 
-def main():
-    """Main analysis workflow."""
+def main(data_dir: str = DEFAULT_DATA_DIR, viz_dir: str = DEFAULT_OUTPUT_DIR,
+         report_file: str = DEFAULT_REPORT_FILE, n_files: int = 3, preview: bool = False,
+         workers: int = None, metrics: PipelineMetrics = None):
+    """Main analysis workflow.
+    
+    The console analyses re-read the first ``n_files`` shards each run; the
+    charts and report come from the cached summaries of all shards.
+    """
     print("\n" + "=" * 80)
     print("GUIDE DATASET ANALYSIS FOR AGENTIC SOC")
     print("=" * 80)
     print()
     
     # Initialize analyzer
-    data_dir = "/home/runner/work/zte-agentic-soc/zte-agentic-soc/mock-data"
-    analyzer = GUIDEDatasetAnalyzer(data_dir)
+    analyzer = GUIDEDatasetAnalyzer(data_dir, metrics=metrics)
     
-    # Load sample data (first 3 training files for efficiency)
-    analyzer.load_sample_data(n_files=3)
+    # Load sample data (first training files for efficiency); the console
+    # analyses need rows, so this part is not served from the shard cache
+    analyzer.load_sample_data(n_files=n_files)
     
     # Run analyses
     analyzer.get_basic_info()
@@ -789,16 +801,18 @@ def main():
     analyzer.analyze_key_fields()
     analyzer.analyze_temporal_patterns()
     
+    # Summarize all training shards; unchanged shards come from the cache
+    analyzer.load_incremental(os.path.join(viz_dir, ".cache"))
+    
     # Generate visualizations
-    viz_dir = "/home/runner/work/zte-agentic-soc/zte-agentic-soc/mock-data-analysis"
-    analyzer.generate_visualizations(viz_dir)
+    analyzer.generate_visualizations(viz_dir, preview=preview, workers=workers)
     
     # Generate insights
     analyzer.generate_insights()
     
     # Generate comprehensive report
-    report_file = "/home/runner/work/zte-agentic-soc/zte-agentic-soc/MOCK-DATA-ANALYSIS.md"
     analyzer.generate_report(report_file)
+    analyzer.write_metrics(report_file)
     
     print("\n" + "=" * 80)
     print("ANALYSIS COMPLETE!")
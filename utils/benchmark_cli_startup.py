@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark start-up time of the GUIDE analysis CLI.
+
+Runs each command in a fresh interpreter several times and reports the
+median wall time, plus which heavy libraries the command imported. Uses
+real GUIDE shards when ``--data-dir`` has them, otherwise a small synthetic
+shard, so the numbers are dominated by start-up rather than parsing.
+
+Usage:
+    python utils/benchmark_cli_startup.py [--data-dir mock-data] [--runs 5] [--json out.json]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+UTILS_DIR = Path(__file__).resolve().parent
+CLI = UTILS_DIR / "guide_cli.py"
+HEAVY_MODULES = ('pandas', 'numpy', 'matplotlib', 'seaborn')
+
+PROBE = (
+    "import runpy, sys; sys.argv = {argv!r}; "
+    "sys.path.insert(0, {utils!r}); "
+    "code = 0\n"
+    "try:\n"
+    "    runpy.run_path({cli!r}, run_name='__main__')\n"
+    "except SystemExit as e:\n"
+    "    code = e.code or 0\n"
+    "print('LOADED=' + ','.join(m for m in {heavy!r} if m in sys.modules), file=sys.stderr)\n"
+    "sys.exit(code)\n"
+)
+
+
+def time_command(argv, runs):
+    """Return (median seconds, loaded heavy modules) for ``guide_cli argv``."""
+    probe = PROBE.format(argv=[str(CLI)] + argv, utils=str(UTILS_DIR), cli=str(CLI), heavy=HEAVY_MODULES)
+    timings, loaded = [], ''
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-c', probe], capture_output=True, text=True)
+        timings.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            raise RuntimeError(f"guide_cli {' '.join(argv)} failed:\n{result.stderr}")
+        for line in result.stderr.splitlines():
+            if line.startswith('LOADED='):
+                loaded = line[len('LOADED='):]
+    return statistics.median(timings), loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--data-dir', default=None, help='Directory containing GUIDE_Train_*.csv')
+    parser.add_argument('--runs', type=int, default=5, help='Runs per command')
+    parser.add_argument('--json', default=None, help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("GUIDE CLI STARTUP BENCHMARK")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = args.data_dir
+        if not data_dir or not list(Path(data_dir).glob('GUIDE_Train_*.csv')):
+            from guide_synthetic import write_shards
+            data_dir = str(Path(tmp) / 'data')
+            write_shards(data_dir, 2000, n_shards=1)
+
+        commands = {
+            'help': ['--help'],
+            'profile (2 columns)': ['profile', '--data-dir', data_dir, '--columns', 'Category,IncidentGrade'],
+            'temporal': ['temporal', '--data-dir', data_dir, '--files', '1'],
+            'report': ['report', '--data-dir', data_dir, '--output', str(Path(tmp) / 'report.md'),
+                       '--output-dir', str(Path(tmp) / 'out')],
+        }
+
+        results = {}
+        print(f"\n{'Command':<24}{'Median s':>10}  Heavy imports")
+        print("-" * 66)
+        for label, argv in commands.items():
+            median, loaded = time_command(argv, args.runs)
+            results[label] = {'median_seconds': round(median, 4), 'heavy_imports': loaded.split(',') if loaded else []}
+            print(f"{label:<24}{median:>10.3f}  {loaded or '-'}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+        print(f"\n✓ Results saved to: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
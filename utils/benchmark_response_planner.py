@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Benchmark response-action deduplication and batching on a replayed incident burst.
+
+Turns GUIDE alerts into containment requests with a per-EntityType playbook
+(Machine -> IsolateEndpoint, User -> DisableAccount, Ip -> BlockIP, ...),
+compresses their arrivals into a burst of ``--duration`` seconds and
+executes them against ``MockExecutor`` on a virtual clock:
+
+- naive: one executor call per requested action, in arrival order;
+- planner: ``ResponsePlanner`` windows, merged duplicates, dependency
+  ordering and bulk calls.
+
+Synthetic entity IDs are drawn from a small skewed pool (``--entities``)
+so that, as in a real storm, many alerts hit the same hosts and accounts;
+real shards from ``--data-dir`` are used as-is.
+
+Reported: requested vs executed actions, executor calls, completion
+latency per request and burst makespan.
+
+Usage:
+    python utils/benchmark_response_planner.py [--count 20000] [--window 2] [--data-dir mock-data]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from alert_record import infer_severity, parse_timestamp
+from guide_synthetic import generate_frame, load_or_generate
+from response_planner import MockExecutor, ResponseAction, ResponsePlanner
+
+
+# GUIDE EntityType -> (ActionType, TargetEntity type, identifying column,
+# scope column for dependencies or None for the target itself)
+PLAYBOOK = {
+    'Machine': [('IsolateEndpoint', 'Host', 'DeviceId', None)],
+    'User': [('DisableAccount', 'Account', 'AccountUpn', None)],
+    'Ip': [('BlockIP', 'IP', 'IpAddress', None)],
+    'File': [('QuarantineFile', 'File', 'Sha256', 'DeviceId')],
+    'Process': [('TerminateProcess', 'Process', 'FileName', 'DeviceId')],
+}
+# Extra actions for credential theft
+CREDENTIAL_PLAYBOOK = [('ResetPassword', 'Account', 'AccountUpn', None)]
+
+SEVERITY_RISK = {'Critical': 'Critical', 'High': 'High', 'Medium': 'Medium'}
+
+
+def build_requests(df):
+    """Return (arrival timestamp, ResponseAction) pairs for actionable alerts."""
+    requests = []
+    for row in df.itertuples(index=False):
+        severity = infer_severity(row.IncidentGrade, row.Category)
+        if severity not in SEVERITY_RISK:
+            continue
+        steps = list(PLAYBOOK.get(row.EntityType, ()))
+        if row.Category == 'CredentialAccess' and row.EntityType == 'User':
+            steps += CREDENTIAL_PLAYBOOK
+        for action_type, entity_type, column, scope in steps:
+            requests.append((row.Timestamp, ResponseAction(
+                action_type, entity_type, getattr(row, column),
+                risk_level=SEVERITY_RISK[severity],
+                incident_id=str(row.IncidentId), alert_id=str(row.AlertId),
+                scope=getattr(row, scope) if scope else None,
+            )))
+    return requests
+
+
+def skew_entities(df, pool: int, seed: int):
+    """Redraw entity columns from a Zipf-weighted pool of ``pool`` IDs."""
+    rng = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, pool + 1)
+    weights /= weights.sum()
+    for column in ('DeviceId', 'AccountUpn', 'IpAddress', 'Sha256', 'FileName'):
+        df[column] = rng.choice(pool, size=len(df), p=weights)
+    return df
+
+
+def run_naive(arrivals, actions, executor):
+    """Serial executor, one call per request; returns completion times."""
+    completed = np.empty(len(actions))
+    busy_until = 0.0
+    for i, (arrival, action) in enumerate(zip(arrivals, actions)):
+        _, elapsed_ms = executor.execute_batch(action.action_type, [action])
+        busy_until = max(busy_until, arrival) + elapsed_ms / 1000.0
+        completed[i] = busy_until
+    return completed
+
+
+def run_planner(arrivals, actions, executor, planner):
+    """Window, merge and batch requests; returns (completion times, plans)."""
+    completed = np.empty(len(actions))
+    window, plans = [], []
+    busy_until = 0.0
+
+    def flush(now):
+        plan = planner.plan(now)
+        results = planner.execute(plan, executor, now)
+        planned = (action for call in plan.calls for action in call.actions)
+        done_at = {action.key: result['completedAt'] for action, result in zip(planned, results)}
+        for i, key in window:
+            # Suppressed and held-back requests resolve at flush time
+            completed[i] = done_at.get(key, now)
+        window.clear()
+        plans.append(plan)
+        return results[-1]['completedAt'] if results else now
+
+    for i, (arrival, action) in enumerate(zip(arrivals, actions)):
+        # Close windows that ended before this arrival; while the executor is
+        # busy the window keeps collecting, so batches grow under load.
+        while len(planner) and max(planner.deadline(), busy_until) <= arrival:
+            busy_until = flush(max(planner.deadline(), busy_until))
+        planner.submit(action, arrival)
+        window.append((i, action.key))
+    while len(planner):
+        busy_until = flush(max(planner.deadline(), busy_until))
+    return completed, plans
+
+
+def summarize(label, arrivals, completed, executor, wall):
+    latency = completed - arrivals
+    print(f"\n{label}")
+    print("-" * 66)
+    print(f"  Executor calls:               {executor.calls:>14,}")
+    print(f"  Actions executed:             {executor.targets:>14,}")
+    print(f"  Executor busy time (s):       {executor.elapsed_ms / 1000:>14,.1f}")
+    print(f"  Latency p50 / p95 / p99 (s):  {np.percentile(latency, 50):>10.2f} / "
+          f"{np.percentile(latency, 95):.2f} / {np.percentile(latency, 99):.2f}")
+    print(f"  Burst makespan (s):           {completed.max() - arrivals.min():>14,.1f}")
+    print(f"  Planning wall time (ms):      {wall * 1000:>14,.1f}")
+    return latency
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--count', type=int, default=20_000, help='Alerts in the burst')
+    parser.add_argument('--data-dir', default=None, help='Directory containing GUIDE_Train_*.csv')
+    parser.add_argument('--duration', type=float, default=60.0, help='Burst length (seconds)')
+    parser.add_argument('--entities', type=int, default=500, help='Synthetic entity pool size')
+    parser.add_argument('--window', type=float, default=2.0, help='Planner collection window (seconds)')
+    parser.add_argument('--batch-size', type=int, default=100, help='Max targets per bulk call')
+    parser.add_argument('--call-ms', type=float, default=250.0, help='Executor per-call latency (ms)')
+    parser.add_argument('--target-ms', type=float, default=5.0, help='Executor per-target latency (ms)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("RESPONSE ACTION PLANNER BENCHMARK")
+    print("=" * 80)
+
+    if args.data_dir:
+        df = load_or_generate(args.data_dir, args.count, seed=args.seed)
+    else:
+        df = skew_entities(generate_frame(args.count, seed=args.seed), args.entities, args.seed)
+    df = df.sort_values('Timestamp', kind='stable').reset_index(drop=True)
+
+    requests = build_requests(df)
+    if not requests:
+        print("\nNo actionable alerts in the sample")
+        return
+    actions = [action for _, action in requests]
+    ts = np.array([parse_timestamp(t) for t, _ in requests], dtype=float)
+    span = max(ts[-1] - ts[0], 1.0)
+    # Epoch-second clock starting at the first alert, so result timestamps are real
+    arrivals = ts[0] + (ts - ts[0]) * args.duration / span
+
+    unique = len({a.key for a in actions})
+    print(f"\nAlerts: {len(df):,}   Requested actions: {len(actions):,}   "
+          f"Unique (type, target, scope): {unique:,}")
+    print(f"Burst: {args.duration:g}s   Executor: {args.call_ms:g} ms/call + {args.target_ms:g} ms/target")
+
+    naive_exec = MockExecutor(args.call_ms, args.target_ms)
+    start = time.perf_counter()
+    naive_done = run_naive(arrivals, actions, naive_exec)
+    naive_latency = summarize('Naive (one call per request)', arrivals, naive_done,
+                              naive_exec, time.perf_counter() - start)
+
+    planner_exec = MockExecutor(args.call_ms, args.target_ms)
+    planner = ResponsePlanner(window_seconds=args.window, max_batch_size=args.batch_size,
+                              recent_ttl=args.duration * 10)
+    start = time.perf_counter()
+    planned_done, plans = run_planner(arrivals, actions, planner_exec, planner)
+    planned_latency = summarize(f'ResponsePlanner (window {args.window:g}s, batch {args.batch_size})',
+                                arrivals, planned_done, planner_exec, time.perf_counter() - start)
+    suppressed = sum(len(p.suppressed) for p in plans)
+    print(f"  Windows flushed:              {len(plans):>14,}")
+    print(f"  Suppressed (already done):    {suppressed:>14,}")
+
+    print("\n" + "=" * 80)
+    print(f"Executed actions: {naive_exec.targets:,} -> {planner_exec.targets:,} "
+          f"({(1 - planner_exec.targets / naive_exec.targets) * 100:.1f}% fewer)")
+    print(f"Executor calls:   {naive_exec.calls:,} -> {planner_exec.calls:,} "
+          f"({(1 - planner_exec.calls / naive_exec.calls) * 100:.1f}% fewer)")
+    print(f"p95 completion:   {np.percentile(naive_latency, 95):.2f}s -> "
+          f"{np.percentile(planned_latency, 95):.2f}s")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Chart rendering for the GUIDE dataset analysis.
+
+Charts are described by small, picklable specs built from precomputed
+aggregate tables (a ``DatasetSummary``), so rendering never touches the raw
+frame. matplotlib and seaborn are imported lazily, so report-only runs
+never pay for them. Specs are rendered serially unless there are enough
+of them to amortize a worker pool, in which every process imports the
+plotting stack again.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+FULL_DPI = 300
+PREVIEW_DPI = 72
+
+# Fewest full-resolution specs for which the default is a process pool
+PARALLEL_MIN_SPECS = 12
+
+_plt = None
+
+
+def _init_plotting():
+    """Import and configure the plotting stack once per process."""
+    global _plt
+    if _plt is not None:
+        return _plt
+
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    sns.set_style('whitegrid')
+    plt.rcParams['figure.figsize'] = (14, 8)
+    _plt = plt
+    return plt
+
+
+def build_chart_specs(summary) -> List[Dict]:
+    """Build render specs from a ``DatasetSummary``'s aggregate tables."""
+    specs = []
+
+    # 1. Incident Grade Distribution
+    if summary.has('IncidentGrade'):
+        grade_counts = summary.value_counts['IncidentGrade']
+        specs.append({
+            'filename': 'incident_grade_distribution.png',
+            'kind': 'bar',
+            'figsize': (10, 6),
+            'labels': [str(v) for v in grade_counts.index],
+            'values': grade_counts.tolist(),
+            'title': 'Incident Grade Distribution',
+            'xlabel': 'Incident Grade',
+            'ylabel': 'Count',
+        })
+
+    # 2. Top Categories
+    if summary.has('Category'):
+        top_categories = summary.value_counts['Category'].head(10)
+        specs.append({
+            'filename': 'top_categories.png',
+            'kind': 'barh',
+            'figsize': (12, 6),
+            'labels': [str(v) for v in top_categories.index],
+            'values': top_categories.tolist(),
+            'title': 'Top 10 Attack Categories',
+            'xlabel': 'Count',
+        })
+
+    # 3. Entity Type Distribution
+    if summary.has('EntityType'):
+        entity_counts = summary.value_counts['EntityType']
+        specs.append({
+            'filename': 'entity_type_distribution.png',
+            'kind': 'bar',
+            'figsize': (10, 6),
+            'labels': [str(v) for v in entity_counts.index],
+            'values': entity_counts.tolist(),
+            'title': 'Entity Type Distribution',
+            'xlabel': 'Entity Type',
+            'ylabel': 'Count',
+        })
+
+    # 4. Temporal pattern - hourly
+    if len(summary.hourly_counts) > 0:
+        specs.append({
+            'filename': 'hourly_pattern.png',
+            'kind': 'line',
+            'figsize': (12, 6),
+            'labels': [int(v) for v in summary.hourly_counts.index],
+            'values': summary.hourly_counts.tolist(),
+            'title': 'Alert Volume by Hour of Day',
+            'xlabel': 'Hour of Day',
+            'ylabel': 'Number of Alerts',
+        })
+
+    # 5. Missing data
+    missing_pct = summary.null_pct()
+    missing_pct = missing_pct[missing_pct > 0].sort_values(ascending=False)
+    if len(missing_pct) > 0:
+        specs.append({
+            'filename': 'data_completeness.png',
+            'kind': 'barh',
+            'figsize': (12, 8),
+            'labels': [str(v) for v in missing_pct.index],
+            'values': missing_pct.tolist(),
+            'title': 'Data Completeness by Column',
+            'xlabel': 'Missing Percentage (%)',
+        })
+
+    return specs
+
+
+def render_chart(spec: Dict, output_dir: str, dpi: int = FULL_DPI) -> str:
+    """Render one chart spec to ``output_dir`` and return the file name."""
+    plt = _init_plotting()
+    labels, values = spec['labels'], spec['values']
+
+    plt.figure(figsize=spec['figsize'])
+    if spec['kind'] == 'bar':
+        plt.bar(range(len(values)), values)
+        plt.xticks(range(len(values)), labels, rotation=45, ha='right')
+    elif spec['kind'] == 'barh':
+        plt.barh(range(len(values)), values)
+        plt.yticks(range(len(values)), labels)
+    elif spec['kind'] == 'line':
+        plt.plot(labels, values, marker='o', linewidth=2)
+        plt.grid(True, alpha=0.3)
+    else:
+        raise ValueError(f"Unknown chart kind: {spec['kind']}")
+
+    plt.title(spec['title'], fontsize=14, fontweight='bold')
+    if spec.get('xlabel'):
+        plt.xlabel(spec['xlabel'])
+    if spec.get('ylabel'):
+        plt.ylabel(spec['ylabel'])
+    plt.tight_layout()
+    plt.savefig(Path(output_dir) / spec['filename'], dpi=dpi, bbox_inches='tight')
+    plt.close()
+    return spec['filename']
+
+
+def render_charts(specs: List[Dict], output_dir: str, dpi: int = FULL_DPI,
+                  workers: Optional[int] = None) -> List[str]:
+    """
+    Render chart specs, in parallel worker processes when ``workers`` > 1.
+
+    ``workers`` defaults to serial rendering for previews and for fewer
+    than ``PARALLEL_MIN_SPECS`` specs, where pool start-up outweighs the
+    rendering; otherwise to one process per chart, capped at the CPU count.
+    """
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    if not specs:
+        return []
+    if workers is None:
+        if dpi <= PREVIEW_DPI or len(specs) < PARALLEL_MIN_SPECS:
+            workers = 1
+        else:
+            workers = min(len(specs), os.cpu_count() or 1)
+
+    if workers <= 1:
+        return [render_chart(spec, output_dir, dpi) for spec in specs]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_plotting) as pool:
+        futures = [pool.submit(render_chart, spec, output_dir, dpi) for spec in specs]
+        return [future.result() for future in futures]
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Command-line interface for the GUIDE dataset analysis utilities.
+
+Each subcommand imports only the libraries it needs, so quick queries such
+as ``profile --columns Category,IncidentGrade`` do not pay for matplotlib,
+seaborn or the full analyzer.
+
+Usage:
+    python utils/guide_cli.py profile --columns Category,IncidentGrade
+    python utils/guide_cli.py temporal --files 3
+    python utils/guide_cli.py charts --output-dir mock-data-analysis --preview
+    python utils/guide_cli.py report --output MOCK-DATA-ANALYSIS.md
+    python utils/guide_cli.py split mock-data/GUIDE_Train.csv --max-size-mb 95
+    python utils/guide_cli.py evaluate --scorer detector-prior --test-fraction 0.2
+    python utils/guide_cli.py all
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from guide_paths import DEFAULT_DATA_DIR, DEFAULT_OUTPUT_DIR, DEFAULT_REPORT_FILE
+
+
+def _train_files(data_dir, n_files=None):
+    files = sorted(Path(data_dir).glob('GUIDE_Train_*.csv'))
+    return files if n_files is None else files[:n_files]
+
+
+def _fraction(text):
+    """argparse type for a fraction in [0, 1)."""
+    value = float(text)
+    if not 0 <= value < 1:
+        raise argparse.ArgumentTypeError(f"must be in [0, 1), got {text}")
+    return value
+
+
+def _require_train_files(args):
+    """Return the selected shards, or None after printing why there are none."""
+    files = _train_files(args.data_dir, args.files)
+    if not files:
+        print(f"No GUIDE_Train_*.csv files found in {args.data_dir}")
+        return None
+    return files
+
+
+def _cache_dir(args):
+    return args.cache_dir or str(Path(args.output_dir) / ".cache")
+
+
+def _metrics(args, pipeline='guide-analysis'):
+    """Build a PipelineMetrics from the --profile* options."""
+    from instrumentation import PipelineMetrics
+
+    stages = args.profile_stages.split(',') if args.profile_stages else None
+    return PipelineMetrics(pipeline, profiler=args.profile,
+                           profile_dir=args.profile_dir, profile_stages=stages)
+
+
+def cmd_profile(args):
+    """Profile selected columns: dtype, nulls, cardinality and top values."""
+    import pandas as pd
+
+    files = _require_train_files(args)
+    if files is None:
+        return 1
+    columns = [col.strip() for col in args.columns.split(',')] if args.columns else None
+    if columns:
+        header = pd.read_csv(files[0], nrows=0).columns
+        unknown = [col for col in columns if col not in header]
+        if unknown:
+            print(f"error: unknown column(s) {', '.join(unknown)}; available: {', '.join(header)}",
+                  file=sys.stderr)
+            return 2
+
+    df = pd.concat((pd.read_csv(f, usecols=columns) for f in files), ignore_index=True)
+    print(f"Profiled {len(df):,} records from {len(files)} files\n")
+    for col in df.columns:
+        series = df[col]
+        null_count = int(series.isnull().sum())
+        print(f"{col}:")
+        print(f"  Type: {series.dtype}")
+        print(f"  Nulls: {null_count:,} ({null_count / len(df) * 100:.1f}%)")
+        print(f"  Unique: {series.nunique():,}")
+        for value, count in series.value_counts().head(args.top).items():
+            print(f"    {value}: {count:,}")
+    return 0
+
+
+def cmd_temporal(args):
+    """Run the temporal analysis over the Timestamp column only."""
+    from analyze_mock_data import GUIDEDatasetAnalyzer
+
+    analyzer = GUIDEDatasetAnalyzer(args.data_dir)
+    analyzer.load_sample_data(n_files=args.files, columns=['Timestamp'])
+    analyzer.analyze_temporal_patterns()
+    return 0
+
+
+def cmd_charts(args):
+    """Render charts from the (cached) per-shard summaries."""
+    from analyze_mock_data import GUIDEDatasetAnalyzer
+
+    if _require_train_files(args) is None:
+        return 1
+
+    analyzer = GUIDEDatasetAnalyzer(args.data_dir, metrics=_metrics(args))
+    analyzer.load_incremental(_cache_dir(args), n_files=args.files)
+    analyzer.generate_visualizations(args.output_dir, preview=args.preview, workers=args.workers)
+    analyzer.metrics.write_json(Path(args.output_dir) / "charts.metrics.json")
+    analyzer.metrics.print_summary()
+    return 0
+
+
+def cmd_report(args):
+    """Write the markdown report from the (cached) per-shard summaries."""
+    from analyze_mock_data import GUIDEDatasetAnalyzer
+
+    if _require_train_files(args) is None:
+        return 1
+
+    analyzer = GUIDEDatasetAnalyzer(args.data_dir, metrics=_metrics(args))
+    analyzer.load_incremental(_cache_dir(args), n_files=args.files)
+    analyzer.generate_insights()
+    analyzer.generate_report(args.output)
+    if args.charts:
+        analyzer.generate_visualizations(args.output_dir, preview=args.preview, workers=args.workers)
+    analyzer.write_metrics(args.output)
+    return 0
+
+
+def cmd_split(args):
+    """Split large CSV files into header-preserving chunks."""
+    from split_csv import split_csv
+
+    for file in args.inputs:
+        if not Path(file).exists():
+            print(f"File not found: {file}")
+            continue
+        print(f"\nProcessing {file}...")
+        split_csv(file, max_size_mb=args.max_size_mb)
+    return 0
+
+
+def cmd_evaluate(args):
+    """Evaluate a triage scorer on a chronological, OrgId-aware split."""
+    import json
+    from triage_eval import evaluate, load_scorer, print_results
+
+    extra = args.columns.split(',') if args.columns else ()
+    results = evaluate(args.data_dir, load_scorer(args.scorer), pattern=args.pattern,
+                       n_files=args.files, extra_columns=extra, test_fraction=args.test_fraction,
+                       mode=args.split_mode, holdout_org_fraction=args.holdout_orgs,
+                       batch_size=args.batch_size, metrics=_metrics(args, 'triage-eval'))
+    print_results(results)
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+        print(f"\n✓ Results saved to: {args.output}")
+    return 0
+
+
+def cmd_all(args):
+    """Run the full analysis workflow (console analyses, charts and report).
+
+    Only charts and report are incremental; the console analyses parse
+    ``--files`` shards on every run.
+    """
+    from analyze_mock_data import main as run_all
+
+    if _require_train_files(args) is None:
+        return 1
+    run_all(args.data_dir, args.output_dir, args.output, n_files=args.files,
+            preview=args.preview, workers=args.workers, metrics=_metrics(args))
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='guide_cli',
+        description='GUIDE dataset analysis utilities for the Agentic SOC.',
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    def add_data_args(sub, files_help='Number of training files to use (default: all)'):
+        sub.add_argument('--data-dir', default=str(DEFAULT_DATA_DIR),
+                         help='Directory containing GUIDE_Train_*.csv files')
+        sub.add_argument('--files', type=int, default=None, help=files_help)
+
+    def add_output_args(sub):
+        sub.add_argument('--output-dir', default=str(DEFAULT_OUTPUT_DIR),
+                         help='Directory for charts and the shard cache')
+        sub.add_argument('--cache-dir', default=None,
+                         help='Per-shard result cache (default: <output-dir>/.cache)')
+        sub.add_argument('--preview', action='store_true', help='Render charts at low dpi')
+        sub.add_argument('--workers', type=int, default=None, help='Chart rendering processes (default: serial for few charts)')
+        add_profile_args(sub)
+
+    def add_profile_args(sub):
+        sub.add_argument('--profile', choices=('cprofile', 'sampling'), default=None,
+                         help='Profile each stage with cProfile or the sampling profiler')
+        sub.add_argument('--profile-dir', default='profiles', help='Directory for profiler output')
+        sub.add_argument('--profile-stages', default=None,
+                         help='Comma-separated stages to profile (default: all)')
+
+    sub = subparsers.add_parser('profile', help=cmd_profile.__doc__)
+    add_data_args(sub, files_help='Number of training files to profile (default: 1)')
+    sub.add_argument('--columns', default=None, help='Comma-separated columns to profile (default: all)')
+    sub.add_argument('--top', type=int, default=5, help='Top values to show per column')
+    sub.set_defaults(func=cmd_profile, files=1)
+
+    sub = subparsers.add_parser('temporal', help=cmd_temporal.__doc__)
+    add_data_args(sub, files_help='Number of training files to analyze (default: 3)')
+    sub.set_defaults(func=cmd_temporal, files=3)
+
+    sub = subparsers.add_parser('charts', help=cmd_charts.__doc__)
+    add_data_args(sub)
+    add_output_args(sub)
+    sub.set_defaults(func=cmd_charts)
+
+    sub = subparsers.add_parser('report', help=cmd_report.__doc__)
+    add_data_args(sub)
+    add_output_args(sub)
+    sub.add_argument('--output', default=str(DEFAULT_REPORT_FILE), help='Markdown report path')
+    sub.add_argument('--charts', action='store_true', help='Also render charts into --output-dir')
+    sub.set_defaults(func=cmd_report)
+
+    sub = subparsers.add_parser('split', help=cmd_split.__doc__)
+    sub.add_argument('inputs', nargs='+', help='CSV files to split')
+    sub.add_argument('--max-size-mb', type=int, default=95, help='Maximum size of each chunk')
+    sub.set_defaults(func=cmd_split)
+
+    sub = subparsers.add_parser('evaluate', help=cmd_evaluate.__doc__)
+    add_data_args(sub)
+    add_profile_args(sub)
+    sub.add_argument('--pattern', default='GUIDE_Train_*.csv', help='Shard file glob')
+    sub.add_argument('--scorer', default='detector-prior',
+                     help='Built-in scorer (majority, detector-prior) or module:Class')
+    sub.add_argument('--columns', default=None, help='Extra comma-separated columns the scorer needs')
+    sub.add_argument('--test-fraction', type=_fraction, default=0.2, help='Fraction of incidents held out')
+    sub.add_argument('--split-mode', choices=('per-org', 'global'), default='per-org',
+                     help='Per-organization or single global time cutoff')
+    sub.add_argument('--holdout-orgs', type=_fraction, default=0.0,
+                     help='Fraction of organizations moved entirely to the test split')
+    sub.add_argument('--batch-size', type=int, default=100_000, help='Rows per scoring batch')
+    sub.add_argument('--output', default=None, help='Write results JSON to this path')
+    sub.set_defaults(func=cmd_evaluate)
+
+    sub = subparsers.add_parser('all', help=' '.join(cmd_all.__doc__.split()))
+    add_data_args(sub, files_help='Number of training files for the console analyses (default: 3)')
+    add_output_args(sub)
+    sub.add_argument('--output', default=str(DEFAULT_REPORT_FILE), help='Markdown report path')
+    sub.set_defaults(func=cmd_all, files=3)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
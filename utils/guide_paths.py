@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""
+Default locations of the GUIDE data and analysis outputs.
+
+Shared by the analyzer and its command-line front-end; kept free of heavy
+imports so the CLI can load it at startup.
+"""
+
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_DATA_DIR = REPO_ROOT / "mock-data"
+DEFAULT_OUTPUT_DIR = REPO_ROOT / "mock-data-analysis"
+DEFAULT_REPORT_FILE = REPO_ROOT / "MOCK-DATA-ANALYSIS.md"
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Synthetic GUIDE-shaped data for benchmarks.
+
+The real GUIDE shards are not checked into the repository, so benchmark
+scripts fall back to these generators. Column names, null rates and value
+cardinalities follow guide-dataset-analysis.md closely enough to make
+memory and throughput numbers representative.
+"""
+
+import csv
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from alert_record import CODECS, ENTITY_COLUMNS, GUIDE_COLUMNS
+
+
+CATEGORY_WEIGHTS = {
+    'InitialAccess': 530357, 'Exfiltration': 195287, 'SuspiciousActivity': 124490,
+    'CommandAndControl': 101720, 'Impact': 93212, 'CredentialAccess': 37262,
+    'Execution': 33328, 'Malware': 17809, 'Discovery': 16079, 'Persistence': 9021,
+}
+GRADE_WEIGHTS = {'BenignPositive': 43.15, 'TruePositive': 34.93, 'FalsePositive': 21.39}
+ENTITY_TYPES = CODECS['EntityType'].values[:12]
+MITRE_TECHNIQUES = ['T1078', 'T1078.004', 'T1566', 'T1566.002', 'T1110', 'T1059', 'T1071', 'T1486', 'T1048']
+THREAT_FAMILIES = ['Emotet', 'Qakbot', 'Cobaltstrike', 'Mimikatz', 'Lumma']
+
+START_TIME = datetime(2023, 12, 1, tzinfo=timezone.utc)
+
+
+def generate_rows(n: int, seed: int = 0, n_orgs: int = 4600,
+                  org_skew: float = 1.2, span_days: int = 198) -> Iterator[Dict[str, object]]:
+    """
+    Yield ``n`` GUIDE-like rows as dicts keyed by GUIDE column name.
+
+    OrgIds follow a Zipf-like distribution controlled by ``org_skew`` so a
+    handful of tenants dominate, as in the real dataset.
+    """
+    rng = random.Random(seed)
+    categories = list(CATEGORY_WEIGHTS)
+    cat_weights = list(CATEGORY_WEIGHTS.values())
+    grades = list(GRADE_WEIGHTS)
+    grade_weights = list(GRADE_WEIGHTS.values())
+    org_weights = [1.0 / (rank ** org_skew) for rank in range(1, n_orgs + 1)]
+    span_seconds = span_days * 86400
+
+    for i in range(n):
+        incident_id = rng.randrange(n // 4 + 1)
+        row = {
+            'Id': i,
+            'OrgId': rng.choices(range(n_orgs), org_weights)[0],
+            'IncidentId': incident_id,
+            'AlertId': rng.randrange(n // 2 + 1),
+            'Timestamp': (START_TIME + timedelta(seconds=rng.randrange(span_seconds))).strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+            'DetectorId': rng.randrange(6000),
+            'AlertTitle': rng.randrange(50000),
+            'Category': rng.choices(categories, cat_weights)[0],
+            'MitreTechniques': ';'.join(rng.sample(MITRE_TECHNIQUES, rng.randint(1, 2))) if rng.random() < 0.425 else None,
+            'IncidentGrade': rng.choices(grades, grade_weights)[0] if rng.random() > 0.005 else None,
+            'ActionGrouped': 'ContainAccount' if rng.random() < 0.006 else None,
+            'ActionGranular': None,
+            'EntityType': rng.choice(ENTITY_TYPES),
+            'EvidenceRole': 'Impacted' if rng.random() < 0.3 else 'Related',
+            'EmailClusterId': float(rng.randrange(6500)) if rng.random() < 0.01 else None,
+            'ThreatFamily': rng.choice(THREAT_FAMILIES) if rng.random() < 0.008 else None,
+            'ResourceType': None,
+            'Roles': 'Suspicious' if rng.random() < 0.023 else None,
+            'AntispamDirection': 'Inbound' if rng.random() < 0.019 else None,
+            'SuspicionLevel': 'Suspicious' if rng.random() < 0.152 else None,
+            'LastVerdict': 'Malicious' if rng.random() < 0.235 else None,
+        }
+        if row['ActionGrouped']:
+            row['ActionGranular'] = 'DisableUser'
+        for col in ENTITY_COLUMNS:
+            row[col] = rng.randrange(100000)
+        yield row
+
+
+def write_shards(output_dir: str, n_rows: int, n_shards: int = 4, seed: int = 0,
+                 prefix: str = 'GUIDE_Train', **kwargs) -> List[Path]:
+    """Write ``n_rows`` synthetic rows split over ``n_shards`` CSV files."""
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    per_shard = -(-n_rows // n_shards)
+    rows = generate_rows(n_rows, seed=seed, **kwargs)
+    paths = []
+    for shard in range(n_shards):
+        path = output_path / f"{prefix}_{shard:02d}.csv"
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=GUIDE_COLUMNS)
+            writer.writeheader()
+            for _ in range(per_shard):
+                row = next(rows, None)
+                if row is None:
+                    break
+                writer.writerow(row)
+        paths.append(path)
+    return paths
+
+
+def generate_frame(n: int, seed: int = 0, **kwargs):
+    """Return ``n`` synthetic rows as a pandas DataFrame in GUIDE column order."""
+    import pandas as pd
+
+    return pd.DataFrame(list(generate_rows(n, seed=seed, **kwargs)), columns=list(GUIDE_COLUMNS))
+
+
+def load_or_generate(data_dir: Optional[str], n: int, seed: int = 0):
+    """Load up to ``n`` rows from the first GUIDE train shards, or synthesise them."""
+    import pandas as pd
+
+    if data_dir:
+        files = sorted(Path(data_dir).glob('GUIDE_Train_*.csv'))
+        if files:
+            dfs, remaining = [], n
+            for file in files:
+                df = pd.read_csv(file, nrows=remaining)
+                dfs.append(df)
+                remaining -= len(df)
+                if remaining <= 0:
+                    break
+            return pd.concat(dfs, ignore_index=True)
+    return generate_frame(n, seed=seed)
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Local threat-intelligence indicator store for bulk alert enrichment.
+
+Indicators (IOCs) are reduced to 64-bit keys that fold in their IOCType,
+deduplicated, sorted and written as ``.npy`` files that are opened with
+``np.load(mmap_mode='r')``, so millions of indicators load in
+milliseconds and share pages between processes. A Bloom filter sized for
+the configured false-positive rate sits in front of the sorted table:
+most alert entities are not indicators, and the filter rejects them
+without touching the table. Survivors are resolved exactly with a
+vectorised ``np.searchsorted``.
+
+Every lookup is a batch over a NumPy array, so a whole ``AlertBatch`` or
+DataFrame of GUIDE alerts is enriched with one call per indicator column
+(Sha256, IpAddress, Url, ThreatFamily). Matches use the
+``ThreatIntelligenceMatches`` shape of the triage EnrichmentData
+(data-model.md): IOC, IOCType, Reputation, Source.
+
+Store layout::
+
+    <store>/keys.npy       sorted unique uint64 indicator keys
+    <store>/labels.npy     uint16 index into the manifest label table, per key
+    <store>/bloom.npy      uint64 Bloom filter words
+    <store>/manifest.json  counts, Bloom parameters and (Reputation, Source) labels
+"""
+
+import hashlib
+import json
+import math
+import string
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+import numpy as np
+
+
+# IOCType values from the triage ThreatIntelMatch model plus ThreatFamily names
+IOC_TYPES = ('IP', 'Domain', 'FileHash', 'URL', 'ThreatFamily')
+
+# GUIDE column -> IOCType
+INDICATOR_COLUMNS = {
+    'Sha256': 'FileHash',
+    'IpAddress': 'IP',
+    'Url': 'URL',
+    'ThreatFamily': 'ThreatFamily',
+}
+
+REPUTATIONS = ('Malicious', 'Suspicious', 'Unknown', 'Benign')
+_REPUTATION_RANK = {r: i for i, r in enumerate(REPUTATIONS)}
+
+MISS = -1
+
+_MASK32 = np.uint64(0xFFFFFFFF)
+_TYPE_SALT = {t: np.uint64(int.from_bytes(hashlib.blake2b(t.encode(), digest_size=8).digest(), 'little'))
+              for t in IOC_TYPES}
+
+
+def _mix64(x: np.ndarray) -> np.ndarray:
+    """SplitMix64 finaliser over a uint64 array (wrapping arithmetic)."""
+    x = x ^ (x >> np.uint64(30))
+    x = x * np.uint64(0xBF58476D1CE4E5B9)
+    x = x ^ (x >> np.uint64(27))
+    x = x * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _string_key(ioc_type: str, value: str) -> int:
+    digest = hashlib.blake2b(f"{ioc_type}:{value}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+_HEX_DIGITS = frozenset(string.hexdigits)
+
+
+def _normalize_url(value: str) -> str:
+    """Lower-case a URL's scheme and host; path, query and fragment keep their case."""
+    has_scheme = '://' in value
+    try:
+        parts = urlsplit(value if has_scheme else '//' + value)
+    except ValueError:
+        return value
+    userinfo, _, hostport = parts.netloc.rpartition('@')
+    netloc = f"{userinfo}@{hostport.lower()}" if userinfo else hostport.lower()
+    url = urlunsplit((parts.scheme.lower(), netloc, parts.path, parts.query, parts.fragment))
+    return url if has_scheme else url[2:]
+
+
+def normalize_indicator(ioc_type: str, value: str) -> str:
+    """
+    Canonical text form of one indicator: stripped, then lower-cased only
+    where the IOCType is case-insensitive (the scheme and host of a URL,
+    hex file hashes; domains, IPs and threat family names entirely).
+    """
+    value = value.strip()
+    if ioc_type == 'URL':
+        return _normalize_url(value)
+    if ioc_type == 'FileHash':
+        return value.lower() if all(c in _HEX_DIGITS for c in value) else value
+    return value.lower()
+
+
+def indicator_keys(ioc_type: str, values) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hash ``values`` of one IOCType to uint64 keys.
+
+    Integer values (GUIDE's anonymised entity IDs, whole floats, or
+    digit-only strings) are mixed numerically; other strings are normalised
+    with ``normalize_indicator`` and hashed with BLAKE2b. Returns
+    ``(keys, valid)`` where ``valid`` is False for nulls and for floats
+    that are not whole numbers.
+    """
+    if ioc_type not in _TYPE_SALT:
+        raise ValueError(f"Unknown IOCType {ioc_type!r}; expected one of {IOC_TYPES}")
+    values = np.asarray(values)
+    salt = _TYPE_SALT[ioc_type]
+
+    if values.dtype.kind in 'iub':
+        with np.errstate(over='ignore'):
+            return _mix64(values.astype(np.uint64) ^ salt), np.ones(len(values), dtype=bool)
+    if values.dtype.kind == 'f':
+        # IDs are integers; truncating 1.5 would collide with 1.0
+        valid = np.isfinite(values) & (values == np.floor(values))
+        keys = np.zeros(len(values), dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            keys[valid] = _mix64(values[valid].astype(np.int64).astype(np.uint64) ^ salt)
+        return keys, valid
+
+    # Strings / objects: hash each distinct value once
+    uniques, inverse = np.unique(values.astype(str), return_inverse=True)
+    unique_keys = np.zeros(len(uniques), dtype=np.uint64)
+    unique_valid = np.ones(len(uniques), dtype=bool)
+    numeric_idx, numeric_vals = [], []
+    for i, raw in enumerate(uniques):
+        value = normalize_indicator(ioc_type, raw)
+        if value.lower() in ('', 'nan', 'none', '<na>'):
+            unique_valid[i] = False
+        elif value.lstrip('-').isdigit():
+            numeric_idx.append(i)
+            numeric_vals.append(int(value))
+        else:
+            unique_keys[i] = _string_key(ioc_type, value)
+    if numeric_idx:
+        with np.errstate(over='ignore'):
+            unique_keys[numeric_idx] = _mix64(np.array(numeric_vals, dtype=np.int64).astype(np.uint64) ^ salt)
+    inverse = inverse.reshape(-1)
+    return unique_keys[inverse], unique_valid[inverse]
+
+
+def _ioc_string(value) -> str:
+    """Render a matched value, printing whole floats (NaN-padded ID columns) as ints."""
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return str(int(value))
+    return str(value)
+
+
+class BloomFilter:
+    """
+    Bloom filter over uint64 keys with double hashing.
+
+    Probe ``i`` of a key tests bit ``(lo + i * hi) mod n_bits`` where
+    ``lo``/``hi`` are the key's 32-bit halves (``hi`` forced odd).
+    """
+
+    def __init__(self, words: np.ndarray, n_bits: int, n_hashes: int):
+        self.words = words
+        self.n_bits = n_bits
+        self.n_hashes = n_hashes
+
+    @classmethod
+    def for_capacity(cls, n: int, fp_rate: float = 0.01) -> 'BloomFilter':
+        """Size a filter for ``n`` keys at the target false-positive rate."""
+        n = max(n, 1)
+        n_bits = max(64, math.ceil(-n * math.log(fp_rate) / math.log(2) ** 2))
+        n_bits = -(-n_bits // 64) * 64
+        n_hashes = max(1, round(n_bits / n * math.log(2)))
+        return cls(np.zeros(n_bits // 64, dtype=np.uint64), n_bits, n_hashes)
+
+    @property
+    def nbytes(self) -> int:
+        return self.words.nbytes
+
+    def _positions(self, keys: np.ndarray):
+        lo = keys & _MASK32
+        hi = (keys >> np.uint64(32)) | np.uint64(1)
+        n_bits = np.uint64(self.n_bits)
+        with np.errstate(over='ignore'):
+            for i in range(self.n_hashes):
+                yield (lo + np.uint64(i) * hi) % n_bits
+
+    def add(self, keys: np.ndarray):
+        keys = np.asarray(keys, dtype=np.uint64)
+        for pos in self._positions(keys):
+            np.bitwise_or.at(self.words, pos >> np.uint64(6), np.uint64(1) << (pos & np.uint64(63)))
+
+    def might_contain(self, keys: np.ndarray) -> np.ndarray:
+        """Boolean mask: False means definitely absent."""
+        keys = np.asarray(keys, dtype=np.uint64)
+        result = np.ones(len(keys), dtype=bool)
+        candidates = np.arange(len(keys))
+        for i in range(self.n_hashes):
+            # Only keep probing keys that have survived every earlier probe
+            sub = keys[candidates]
+            lo = sub & _MASK32
+            hi = (sub >> np.uint64(32)) | np.uint64(1)
+            with np.errstate(over='ignore'):
+                pos = (lo + np.uint64(i) * hi) % np.uint64(self.n_bits)
+            bit = (self.words[pos >> np.uint64(6)] >> (pos & np.uint64(63))) & np.uint64(1)
+            absent = bit == 0
+            result[candidates[absent]] = False
+            candidates = candidates[~absent]
+            if not len(candidates):
+                break
+        return result
+
+    def expected_fp_rate(self, n: int) -> float:
+        """Theoretical false-positive rate after ``n`` insertions."""
+        return (1 - math.exp(-self.n_hashes * n / self.n_bits)) ** self.n_hashes
+
+
+class IndicatorStore:
+    """
+    Sorted, memory-mapped indicator table with a Bloom-filter prefilter.
+
+    Build with ``IndicatorStore.build`` and reopen with
+    ``IndicatorStore.open``. ``use_bloom=False`` skips the prefilter and
+    searches the table for every key.
+    """
+
+    def __init__(self, keys: np.ndarray, labels: np.ndarray, bloom: BloomFilter,
+                 label_table: List[Tuple[str, str]], path: Optional[Path] = None,
+                 use_bloom: bool = True):
+        self.keys = keys
+        self.labels = labels
+        self.bloom = bloom
+        self.label_table = label_table
+        self.path = path
+        self.use_bloom = use_bloom
+
+    def __len__(self):
+        return len(self.keys)
+
+    @classmethod
+    def build(cls, path: str, feeds: Iterable[Tuple[str, Sequence, str, str]],
+              fp_rate: float = 0.01) -> 'IndicatorStore':
+        """
+        Build a store at ``path`` from ``(ioc_type, values, reputation, source)`` feeds.
+
+        An indicator listed by several feeds keeps the most severe
+        reputation (Malicious > Suspicious > Unknown > Benign).
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        label_table: List[Tuple[str, str]] = []
+        label_index: Dict[Tuple[str, str], int] = {}
+        key_parts, label_parts = [], []
+        for ioc_type, values, reputation, source in feeds:
+            if reputation not in _REPUTATION_RANK:
+                raise ValueError(f"Unknown Reputation {reputation!r}")
+            label = (reputation, source)
+            if label not in label_index:
+                label_index[label] = len(label_table)
+                label_table.append(label)
+            keys, valid = indicator_keys(ioc_type, values)
+            keys = keys[valid]
+            key_parts.append(keys)
+            label_parts.append(np.full(len(keys), label_index[label], dtype=np.uint16))
+
+        keys = np.concatenate(key_parts) if key_parts else np.empty(0, dtype=np.uint64)
+        labels = np.concatenate(label_parts) if label_parts else np.empty(0, dtype=np.uint16)
+        rank = np.array([_REPUTATION_RANK[r] for r, _ in label_table], dtype=np.uint8)
+        order = np.lexsort((rank[labels], keys))
+        keys, labels = keys[order], labels[order]
+        first = np.ones(len(keys), dtype=bool)
+        first[1:] = keys[1:] != keys[:-1]
+        keys, labels = keys[first], labels[first]
+
+        bloom = BloomFilter.for_capacity(len(keys), fp_rate)
+        bloom.add(keys)
+
+        np.save(path / 'keys.npy', keys)
+        np.save(path / 'labels.npy', labels)
+        np.save(path / 'bloom.npy', bloom.words)
+        (path / 'manifest.json').write_text(json.dumps({
+            'Indicators': int(len(keys)),
+            'BloomBits': bloom.n_bits,
+            'BloomHashes': bloom.n_hashes,
+            'TargetFpRate': fp_rate,
+            'Labels': [list(label) for label in label_table],
+        }, indent=2))
+        return cls.open(path)
+
+    @classmethod
+    def open(cls, path: str, mmap: bool = True, use_bloom: bool = True) -> 'IndicatorStore':
+        """Open a built store; with ``mmap`` the arrays are paged in on demand."""
+        path = Path(path)
+        manifest = json.loads((path / 'manifest.json').read_text())
+        mode = 'r' if mmap else None
+        keys = np.load(path / 'keys.npy', mmap_mode=mode)
+        labels = np.load(path / 'labels.npy', mmap_mode=mode)
+        words = np.load(path / 'bloom.npy', mmap_mode=mode)
+        bloom = BloomFilter(words, manifest['BloomBits'], manifest['BloomHashes'])
+        label_table = [tuple(label) for label in manifest['Labels']]
+        return cls(keys, labels, bloom, label_table, path, use_bloom)
+
+    def lookup_keys(self, keys: np.ndarray) -> np.ndarray:
+        """Label index per key (int32), ``MISS`` where the key is not an indicator."""
+        keys = np.asarray(keys, dtype=np.uint64)
+        result = np.full(len(keys), MISS, dtype=np.int32)
+        if not len(self.keys) or not len(keys):
+            return result
+        candidates = np.flatnonzero(self.bloom.might_contain(keys)) if self.use_bloom else np.arange(len(keys))
+        if not len(candidates):
+            return result
+        probe = keys[candidates]
+        pos = np.searchsorted(self.keys, probe)
+        pos[pos == len(self.keys)] = 0
+        found = self.keys[pos] == probe
+        result[candidates[found]] = self.labels[pos[found]]
+        return result
+
+    def lookup(self, ioc_type: str, values) -> np.ndarray:
+        """Label index per value (int32), ``MISS`` for non-indicators and nulls."""
+        keys, valid = indicator_keys(ioc_type, values)
+        result = np.full(len(keys), MISS, dtype=np.int32)
+        result[valid] = self.lookup_keys(keys[valid])
+        return result
+
+    def contains(self, ioc_type: str, values) -> np.ndarray:
+        """Boolean membership mask over ``values``."""
+        return self.lookup(ioc_type, values) != MISS
+
+    def enrich_columns(self, n_rows: int, columns: Dict[str, Tuple[Optional[np.ndarray], np.ndarray]]
+                       ) -> Tuple[np.ndarray, Dict[int, List[Dict[str, str]]]]:
+        """
+        Match indicator columns for ``n_rows`` alerts.
+
+        ``columns`` maps a GUIDE column in ``INDICATOR_COLUMNS`` to
+        ``(rows, values)``; ``rows`` is None for dense columns or the row
+        indices of a sparse column. Returns per-row hit counts (int8) and
+        ``{row: [ThreatIntelMatch, ...]}`` for rows with at least one hit.
+        """
+        hits = np.zeros(n_rows, dtype=np.int8)
+        matches: Dict[int, List[Dict[str, str]]] = {}
+        for column, (rows, values) in columns.items():
+            ioc_type = INDICATOR_COLUMNS[column]
+            codes = self.lookup(ioc_type, values)
+            matched = np.flatnonzero(codes != MISS)
+            if not len(matched):
+                continue
+            hit_rows = matched if rows is None else np.asarray(rows)[matched]
+            hits[hit_rows] += 1
+            for row, i in zip(hit_rows.tolist(), matched.tolist()):
+                reputation, source = self.label_table[codes[i]]
+                matches.setdefault(row, []).append({
+                    'IOC': _ioc_string(values[i]),
+                    'IOCType': ioc_type,
+                    'Reputation': reputation,
+                    'Source': source,
+                })
+        return hits, matches
+
+    def enrich_frame(self, df):
+        """
+        Return ``df`` with ``ThreatIntelHits`` and ``ThreatIntelMatches`` columns.
+
+        ``ThreatIntelMatches`` holds a list of matches for alerts with hits
+        and None elsewhere.
+        """
+        columns = {col: (None, df[col].to_numpy()) for col in INDICATOR_COLUMNS if col in df}
+        hits, matches = self.enrich_columns(len(df), columns)
+        out = df.copy()
+        out['ThreatIntelHits'] = hits
+        enriched = np.full(len(df), None, dtype=object)
+        for row, row_matches in matches.items():
+            enriched[row] = row_matches
+        out['ThreatIntelMatches'] = enriched
+        return out
+
+    def enrich_batch(self, batch) -> Tuple[np.ndarray, Dict[int, List[Dict[str, str]]]]:
+        """Match an ``AlertBatch``: dense entity columns plus sparse ThreatFamily."""
+        columns = {}
+        for col in INDICATOR_COLUMNS:
+            if col in batch.columns:
+                columns[col] = (None, batch.columns[col])
+            elif col in batch.sparse:
+                columns[col] = batch.sparse[col]
+        return self.enrich_columns(len(batch), columns)
+
+    def disk_bytes(self) -> int:
+        """On-disk size of the store."""
+        return sum(f.stat().st_size for f in self.path.iterdir()) if self.path else 0
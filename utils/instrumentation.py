@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Stage-level instrumentation for the analysis pipeline and future agent stages.
+
+``PipelineMetrics`` records, per named stage: wall time, rows processed,
+bytes read, RSS at start and end, the stage's own peak RSS, call count and
+errors. On Linux the peak is per stage: the kernel's VmHWM high-water mark
+is reset through ``/proc/self/clear_refs`` when a stage starts. Elsewhere
+it falls back to the process-lifetime ``ru_maxrss``, labelled as such. Per-stage
+aggregates mirror the AgentState ``Metrics`` fields in data-model.md
+(TotalTasksProcessed, SuccessRate, AverageLatencyMs, ErrorCount) so the
+same hooks can back ingestion and triage stages later.
+
+Stages can optionally be profiled with cProfile (``.prof`` files for
+pstats/snakeviz) or a lightweight sampling profiler that writes collapsed
+stacks (``.folded`` files for flamegraph tools).
+"""
+
+import cProfile
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+PROFILERS = ('cprofile', 'sampling')
+
+# ru_maxrss is reported in kilobytes on Linux and bytes on macOS.
+_MAXRSS_SCALE = 1 if sys.platform == 'darwin' else 1024
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process so far, or None where unsupported."""
+    try:
+        import resource  # Unix only
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _MAXRSS_SCALE
+
+
+def _vm_hwm_bytes() -> Optional[int]:
+    """Peak RSS since the last high-water-mark reset (Linux VmHWM), if known."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def reset_peak_rss() -> bool:
+    """Reset the VmHWM high-water mark to current RSS; False where unsupported."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        return False
+    return _vm_hwm_bytes() is not None
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Current resident set size, or None where /proc is unavailable."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def io_read_bytes() -> Optional[int]:
+    """Bytes read by this process via read syscalls (Linux ``rchar``), if known."""
+    try:
+        with open('/proc/self/io') as f:
+            for line in f:
+                if line.startswith('rchar:'):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+class SamplingProfiler:
+    """Samples one thread's stack at a fixed interval into collapsed-stack counts."""
+
+    def __init__(self, interval: float = 0.005, thread_id: Optional[int] = None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{Path(code.co_filename).name}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def write(self, path: Path):
+        """Write collapsed stacks (``frame;frame;frame count`` per line)."""
+        with open(path, 'w') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class StageRecord:
+    """Measurements for a single execution of a stage."""
+
+    __slots__ = ('name', 'started_at', 'wall_ms', 'rows', 'bytes_read', 'io_read_bytes',
+                 'rss_start_bytes', 'rss_bytes', 'peak_rss_bytes', 'peak_rss_source',
+                 'error', 'profile_path')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self.wall_ms = 0.0
+        self.rows = 0
+        self.bytes_read = 0
+        self.io_read_bytes = None
+        self.rss_start_bytes = None
+        self.rss_bytes = None
+        self.peak_rss_bytes = 0
+        self.peak_rss_source = None
+        self.error = None
+        self.profile_path = None
+
+    def add_rows(self, n: int):
+        self.rows += int(n)
+
+    def add_bytes(self, n: int):
+        self.bytes_read += int(n)
+
+    @property
+    def peak_rss_delta_bytes(self) -> Optional[int]:
+        """Peak RSS above the RSS at stage start."""
+        if self.rss_start_bytes is None:
+            return None
+        return max(0, self.peak_rss_bytes - self.rss_start_bytes)
+
+    def to_dict(self) -> Dict:
+        return {
+            'Stage': self.name,
+            'StartedAt': self.started_at,
+            'WallTimeMs': round(self.wall_ms, 3),
+            'RowsProcessed': self.rows,
+            'BytesRead': self.bytes_read,
+            'IoReadBytes': self.io_read_bytes,
+            'RssStartBytes': self.rss_start_bytes,
+            'RssBytes': self.rss_bytes,
+            'PeakRssBytes': self.peak_rss_bytes,
+            'PeakRssDeltaBytes': self.peak_rss_delta_bytes,
+            'PeakRssSource': self.peak_rss_source,
+            'Error': self.error,
+            'ProfilePath': self.profile_path,
+        }
+
+
+class PipelineMetrics:
+    """
+    Collects ``StageRecord``s for a pipeline run.
+
+    ``profiler`` is one of ``PROFILERS`` or None; ``profile_stages`` limits
+    profiling to the named stages (default: all stages).
+    """
+
+    def __init__(self, pipeline: str, profiler: Optional[str] = None,
+                 profile_dir: Optional[str] = None, profile_stages: Optional[Iterable[str]] = None):
+        if profiler is not None and profiler not in PROFILERS:
+            raise ValueError(f"Unknown profiler {profiler!r}; expected one of {PROFILERS}")
+        self.pipeline = pipeline
+        self.profiler = profiler
+        self.profile_dir = Path(profile_dir) if profile_dir else Path('profiles')
+        self.profile_stages = set(profile_stages) if profile_stages else None
+        self.records: List[StageRecord] = []
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self._active: List[StageRecord] = []
+        self._profiling = False
+
+    @property
+    def current(self) -> Optional[StageRecord]:
+        """The innermost running stage, if any."""
+        return self._active[-1] if self._active else None
+
+    def add_rows(self, n: int):
+        if self.current is not None:
+            self.current.add_rows(n)
+
+    def add_bytes(self, n: int):
+        if self.current is not None:
+            self.current.add_bytes(n)
+
+    def _should_profile(self, name: str) -> bool:
+        if self.profiler is None or self._profiling:
+            return False
+        return self.profile_stages is None or name in self.profile_stages
+
+    @contextmanager
+    def stage(self, name: str):
+        """Measure the enclosed block as one execution of stage ``name``."""
+        record = StageRecord(name)
+        self._active.append(record)
+
+        profiler = None
+        if self._should_profile(name):
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+            self._profiling = True
+            if self.profiler == 'cprofile':
+                profiler = cProfile.Profile()
+                profiler.enable()
+            else:
+                profiler = SamplingProfiler()
+                profiler.start()
+
+        # Fold the current high-water mark into enclosing stages before the
+        # reset below discards it.
+        hwm = _vm_hwm_bytes()
+        if hwm is not None:
+            for outer in self._active[:-1]:
+                outer.peak_rss_bytes = max(outer.peak_rss_bytes, hwm)
+        per_stage_peak = reset_peak_rss()
+        record.rss_start_bytes = current_rss_bytes()
+
+        io_start = io_read_bytes()
+        start = time.perf_counter()
+        try:
+            yield record
+        except BaseException as exc:
+            record.error = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            record.wall_ms = (time.perf_counter() - start) * 1000
+            io_end = io_read_bytes()
+            if io_start is not None and io_end is not None:
+                record.io_read_bytes = io_end - io_start
+            record.rss_bytes = current_rss_bytes()
+            hwm = _vm_hwm_bytes() if per_stage_peak else None
+            if hwm is not None:
+                record.peak_rss_bytes = max(record.peak_rss_bytes, hwm)
+                record.peak_rss_source = 'VmHWM'
+            else:
+                peak = peak_rss_bytes()
+                if peak is not None:
+                    record.peak_rss_bytes = peak
+                    record.peak_rss_source = 'ru_maxrss (process lifetime)'
+
+            if profiler is not None:
+                self._profiling = False
+                index = sum(1 for r in self.records if r.name == name)
+                if self.profiler == 'cprofile':
+                    profiler.disable()
+                    path = self.profile_dir / f"{self.pipeline}.{name}.{index}.prof"
+                    profiler.dump_stats(path)
+                else:
+                    profiler.stop()
+                    path = self.profile_dir / f"{self.pipeline}.{name}.{index}.folded"
+                    profiler.write(path)
+                record.profile_path = str(path)
+
+            self._active.pop()
+            self.records.append(record)
+
+    def stage_summary(self) -> Dict[str, Dict]:
+        """Aggregate records per stage name, in first-seen order."""
+        summary: Dict[str, Dict] = {}
+        for record in self.records:
+            entry = summary.setdefault(record.name, {
+                'WallTimeMs': 0.0, 'RowsProcessed': 0, 'BytesRead': 0, 'PeakRssBytes': 0,
+                'PeakRssDeltaBytes': 0, 'PeakRssSource': record.peak_rss_source,
+                'Metrics': {'TotalTasksProcessed': 0, 'SuccessRate': 0.0,
+                            'AverageLatencyMs': 0.0, 'ErrorCount': 0},
+            })
+            entry['WallTimeMs'] += record.wall_ms
+            entry['RowsProcessed'] += record.rows
+            entry['BytesRead'] += record.bytes_read
+            entry['PeakRssBytes'] = max(entry['PeakRssBytes'], record.peak_rss_bytes)
+            entry['PeakRssDeltaBytes'] = max(entry['PeakRssDeltaBytes'], record.peak_rss_delta_bytes or 0)
+            entry['Metrics']['TotalTasksProcessed'] += 1
+            if record.error:
+                entry['Metrics']['ErrorCount'] += 1
+
+        for entry in summary.values():
+            metrics = entry['Metrics']
+            calls = metrics['TotalTasksProcessed']
+            entry['WallTimeMs'] = round(entry['WallTimeMs'], 3)
+            metrics['AverageLatencyMs'] = round(entry['WallTimeMs'] / calls, 3)
+            metrics['SuccessRate'] = round((calls - metrics['ErrorCount']) / calls * 100, 2)
+        return summary
+
+    def to_dict(self) -> Dict:
+        stages = self.stage_summary()
+        total_wall = sum(s['WallTimeMs'] for s in stages.values())
+        calls = sum(s['Metrics']['TotalTasksProcessed'] for s in stages.values())
+        errors = sum(s['Metrics']['ErrorCount'] for s in stages.values())
+        return {
+            'Pipeline': self.pipeline,
+            'StartedAt': self.started_at,
+            'Profiler': self.profiler,
+            'TotalWallTimeMs': round(total_wall, 3),
+            'PeakRssBytes': peak_rss_bytes(),
+            'Metrics': {
+                'TotalTasksProcessed': calls,
+                'SuccessRate': round((calls - errors) / calls * 100, 2) if calls else 100.0,
+                'AverageLatencyMs': round(total_wall / calls, 3) if calls else 0.0,
+                'ErrorCount': errors,
+            },
+            'Stages': stages,
+            'Records': [r.to_dict() for r in self.records],
+        }
+
+    def write_json(self, path: str) -> Path:
+        """Write the metrics document to ``path`` and return it."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2))
+        return path
+
+    def print_summary(self):
+        """Print a per-stage table to stdout."""
+        summary = self.stage_summary()
+        print(f"\n{'Stage':<16}{'Wall ms':>12}{'Rows':>14}{'MB read':>10}{'Peak RSS MB':>14}{'+MB':>10}")
+        print("-" * 76)
+        for name, entry in summary.items():
+            print(f"{name:<16}{entry['WallTimeMs']:>12,.1f}{entry['RowsProcessed']:>14,}"
+                  f"{entry['BytesRead'] / 1024**2:>10,.1f}{entry['PeakRssBytes'] / 1024**2:>14,.1f}"
+                  f"{entry['PeakRssDeltaBytes'] / 1024**2:>10,.1f}")
+        if any(entry['PeakRssSource'] != 'VmHWM' for entry in summary.values()):
+            print("Peak RSS is the process-lifetime maximum (per-stage reset unavailable)")
+
+
+def instrumented(stage_name: str, rows=None):
+    """
+    Method decorator that runs the method inside ``self.metrics.stage()``.
+
+    ``rows`` is an optional callable ``rows(self) -> int`` used when the
+    method did not report rows itself. Methods on objects without a
+    ``metrics`` attribute (or with it set to None) run unmeasured.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            metrics = getattr(self, 'metrics', None)
+            if metrics is None:
+                return func(self, *args, **kwargs)
+            with metrics.stage(stage_name) as record:
+                result = func(self, *args, **kwargs)
+                if rows is not None and record.rows == 0:
+                    record.add_rows(rows(self))
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Deduplicating, batching execution planner for containment actions.
+
+During incident storms many alerts request the same containment action
+against the same entity (isolate the same host, disable the same account).
+``ResponsePlanner`` collects pending ``ResponseAction``s (data-model.md
+section 5) over a short window and then:
+
+1. merges duplicates per (ActionType, TargetEntity, scope), keeping the
+   highest RiskLevel and the union of requesting incidents and alerts;
+2. suppresses actions already completed against the same target recently;
+3. holds back actions that require human approval until ``approve`` or
+   ``reject``, merging later duplicates into the held action, and defers
+   actions whose prerequisite on the same scope is held;
+4. orders the rest by action-type dependency (e.g. isolate an endpoint
+   before terminating processes or quarantining files on it) and RiskLevel;
+5. groups them into bulk calls of at most ``max_batch_size`` targets
+   against a pluggable executor, skipping actions whose prerequisite on
+   the same scope did not succeed.
+
+An action's scope is the entity its prerequisites are matched on: the
+host for process and file actions, the target itself otherwise.
+
+``MockExecutor`` stands in for the real Defender/Entra integrations and
+accounts call latency on a virtual clock.
+"""
+
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+ACTION_TYPES = (
+    'IsolateEndpoint', 'DisableAccount', 'BlockIP',
+    'QuarantineFile', 'TerminateProcess', 'ResetPassword',
+)
+
+# Action types that must succeed on the same scope before another type runs.
+ACTION_DEPENDENCIES = {
+    'TerminateProcess': ('IsolateEndpoint',),
+    'QuarantineFile': ('IsolateEndpoint', 'TerminateProcess'),
+    'ResetPassword': ('DisableAccount',),
+}
+
+RISK_LEVELS = ('Critical', 'High', 'Medium', 'Low')
+_RISK_RANK = {level: i for i, level in enumerate(RISK_LEVELS)}
+
+# incident-response-agent-output.schema.json uses snake_case action types.
+OUTPUT_ACTION_TYPES = {
+    'IsolateEndpoint': 'isolate_endpoint',
+    'DisableAccount': 'disable_account',
+    'BlockIP': 'block_ip',
+    'QuarantineFile': 'quarantine_file',
+    'TerminateProcess': 'terminate_process',
+    'ResetPassword': 'reset_password',
+}
+
+
+def _new_action_id() -> str:
+    """``ACT-<year>-<n>`` with a random 64-bit ``n``, unique across processes and restarts."""
+    return f"ACT-{datetime.now(timezone.utc).year}-{uuid.uuid4().int >> 64}"
+
+
+def dependent_types(action_type: str) -> List[str]:
+    """Action types that depend, directly or transitively, on ``action_type``."""
+    found = []
+    for other in ACTION_TYPES:
+        stack = list(ACTION_DEPENDENCIES.get(other, ()))
+        seen = set()
+        while stack:
+            dep = stack.pop()
+            if dep == action_type:
+                found.append(other)
+                break
+            if dep not in seen:
+                seen.add(dep)
+                stack.extend(ACTION_DEPENDENCIES.get(dep, ()))
+    return found
+
+
+def action_phases(action_types: Iterable[str] = ACTION_TYPES) -> List[List[str]]:
+    """Topologically layer action types by ``ACTION_DEPENDENCIES``."""
+    remaining = list(action_types)
+    done, phases = set(), []
+    while remaining:
+        ready = [t for t in remaining
+                 if all(dep in done or dep not in remaining for dep in ACTION_DEPENDENCIES.get(t, ()))]
+        if not ready:
+            raise ValueError(f"Cyclic action dependencies among {remaining}")
+        phases.append(ready)
+        done.update(ready)
+        remaining = [t for t in remaining if t not in done]
+    return phases
+
+
+_PHASE_OF = {t: i for i, phase in enumerate(action_phases()) for t in phase}
+
+
+class ResponseAction:
+    """A requested containment action (subset of the data-model ResponseAction)."""
+
+    __slots__ = ('action_id', 'action_type', 'entity_type', 'entity_id', 'scope', 'risk_level',
+                 'requires_approval', 'approved', 'requested_time', 'incident_ids', 'alert_ids',
+                 'rationale', 'request_count')
+
+    def __init__(self, action_type: str, entity_type: str, entity_id: str,
+                 risk_level: str = 'Medium', requires_approval: bool = False,
+                 requested_time: float = 0.0, incident_id: Optional[str] = None,
+                 alert_id: Optional[str] = None, rationale: str = '',
+                 action_id: Optional[str] = None, scope: Optional[str] = None):
+        if action_type not in _PHASE_OF:
+            raise ValueError(f"Unknown ActionType {action_type!r}")
+        if risk_level not in _RISK_RANK:
+            raise ValueError(f"Unknown RiskLevel {risk_level!r}")
+        self.action_id = action_id or _new_action_id()
+        self.action_type = action_type
+        self.entity_type = entity_type
+        self.entity_id = str(entity_id)
+        self.scope = self.entity_id if scope is None else str(scope)
+        self.risk_level = risk_level
+        self.requires_approval = requires_approval
+        self.approved = False
+        self.requested_time = requested_time
+        self.incident_ids = {incident_id} if incident_id else set()
+        self.alert_ids = {alert_id} if alert_id else set()
+        self.rationale = rationale
+        self.request_count = 1
+
+    @property
+    def key(self) -> Tuple[str, str, str, str]:
+        """Deduplication key: (ActionType, EntityType, EntityId, scope)."""
+        return (self.action_type, self.entity_type, self.entity_id, self.scope)
+
+    @property
+    def needs_approval(self) -> bool:
+        return self.requires_approval and not self.approved
+
+    def merge(self, other: 'ResponseAction'):
+        """Fold a duplicate request into this one."""
+        if _RISK_RANK[other.risk_level] < _RISK_RANK[self.risk_level]:
+            self.risk_level = other.risk_level
+        if other.requires_approval and not self.requires_approval:
+            self.requires_approval = True
+            self.approved = other.approved
+        self.requested_time = min(self.requested_time, other.requested_time)
+        self.incident_ids |= other.incident_ids
+        self.alert_ids |= other.alert_ids
+        self.request_count += other.request_count
+
+    def to_dict(self) -> Dict:
+        """Render in the data-model ResponseAction shape."""
+        return {
+            'ActionId': self.action_id,
+            'IncidentId': sorted(self.incident_ids)[0] if self.incident_ids else None,
+            'ActionType': self.action_type,
+            'TargetEntity': {'EntityType': self.entity_type, 'EntityId': self.entity_id},
+            'Status': 'ApprovalRequired' if self.needs_approval else ('Approved' if self.approved else 'Pending'),
+            'RiskLevel': self.risk_level,
+            'RequiresApproval': self.requires_approval,
+            'Rationale': self.rationale,
+        }
+
+    def __repr__(self):
+        return (f"ResponseAction({self.action_type} {self.entity_type}:{self.entity_id}, "
+                f"risk={self.risk_level}, requests={self.request_count})")
+
+
+class BatchCall:
+    """One bulk executor call: a single action type over several targets."""
+
+    __slots__ = ('phase', 'action_type', 'actions')
+
+    def __init__(self, phase: int, action_type: str, actions: List[ResponseAction]):
+        self.phase = phase
+        self.action_type = action_type
+        self.actions = actions
+
+    def __len__(self):
+        return len(self.actions)
+
+    def __repr__(self):
+        return f"BatchCall(phase={self.phase}, {self.action_type} x{len(self.actions)})"
+
+
+class ExecutionPlan:
+    """Ordered bulk calls plus the actions held back, deferred or suppressed."""
+
+    def __init__(self, calls: List[BatchCall], awaiting_approval: List[ResponseAction],
+                 suppressed: List[ResponseAction], requested: int,
+                 deferred: Optional[List[ResponseAction]] = None):
+        self.calls = calls
+        self.awaiting_approval = awaiting_approval
+        self.suppressed = suppressed
+        self.requested = requested
+        self.deferred = deferred or []
+
+    @property
+    def unique_actions(self) -> int:
+        return sum(len(call) for call in self.calls)
+
+    def summary(self) -> Dict:
+        return {
+            'RequestedActions': self.requested,
+            'UniqueActions': self.unique_actions,
+            'BulkCalls': len(self.calls),
+            'AwaitingApproval': len(self.awaiting_approval),
+            'DeferredOnApproval': len(self.deferred),
+            'SuppressedRecentlyCompleted': len(self.suppressed),
+        }
+
+
+class ResponsePlanner:
+    """
+    Window-based collector that turns pending requests into an ``ExecutionPlan``.
+
+    ``window_seconds`` is measured from the first pending request.
+    ``recent_ttl`` suppresses repeat requests for targets that completed
+    within that many seconds. Actions awaiting approval, and the actions
+    deferred behind them, stay keyed in the planner across windows until
+    ``approve`` or ``reject``.
+    """
+
+    def __init__(self, window_seconds: float = 2.0, max_batch_size: int = 100,
+                 recent_ttl: float = 300.0):
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self.recent_ttl = recent_ttl
+        self._pending: 'OrderedDict[Tuple[str, str, str, str], ResponseAction]' = OrderedDict()
+        self._requested = 0
+        self._window_start: Optional[float] = None
+        self._completed: Dict[Tuple[str, str, str, str], float] = {}
+        self._held: 'OrderedDict[Tuple[str, str, str, str], ResponseAction]' = OrderedDict()
+        self._deferred: 'OrderedDict[Tuple[str, str, str, str], ResponseAction]' = OrderedDict()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def submit(self, action: ResponseAction, now: Optional[float] = None):
+        """Add a request, merging it into any pending, held or deferred duplicate."""
+        waiting = self._held.get(action.key) or self._deferred.get(action.key)
+        if waiting is not None:
+            waiting.merge(action)
+            return
+        now = action.requested_time if now is None else now
+        if self._window_start is None:
+            self._window_start = now
+        self._requested += 1
+        existing = self._pending.get(action.key)
+        if existing is None:
+            self._pending[action.key] = action
+        else:
+            existing.merge(action)
+
+    def due(self, now: float) -> bool:
+        """True once the collection window for pending requests has elapsed."""
+        return self._window_start is not None and now - self._window_start >= self.window_seconds
+
+    def deadline(self) -> Optional[float]:
+        """Time at which the current window closes (None if nothing is pending)."""
+        return None if self._window_start is None else self._window_start + self.window_seconds
+
+    def awaiting_approval(self) -> List[ResponseAction]:
+        """Actions held for approval, oldest first."""
+        return list(self._held.values())
+
+    def plan(self, now: float = 0.0) -> ExecutionPlan:
+        """Drain pending requests into an ordered plan of bulk calls."""
+        self._expire(now)
+        ready: Dict[str, List[ResponseAction]] = {}
+        awaiting, suppressed, deferred = [], [], []
+        for key, action in self._pending.items():
+            if key in self._completed:
+                suppressed.append(action)
+            elif action.needs_approval:
+                awaiting.append(action)
+                self._held[key] = action
+            else:
+                ready.setdefault(action.action_type, []).append(action)
+
+        # Defer dependents of held actions on the same scope (in phase order,
+        # so a deferred action in turn defers its own dependents)
+        blocked = {(a.action_type, a.scope) for a in self._held.values()}
+        blocked.update((a.action_type, a.scope) for a in self._deferred.values())
+        for action_type in sorted(ready, key=_PHASE_OF.get):
+            runnable = []
+            for action in ready[action_type]:
+                if any((dep, action.scope) in blocked for dep in ACTION_DEPENDENCIES.get(action_type, ())):
+                    blocked.add((action_type, action.scope))
+                    deferred.append(action)
+                    self._deferred[action.key] = action
+                else:
+                    runnable.append(action)
+            ready[action_type] = runnable
+        ready = {t: actions for t, actions in ready.items() if actions}
+
+        calls = []
+        for action_type in sorted(ready, key=lambda t: (_PHASE_OF[t], min(_RISK_RANK[a.risk_level] for a in ready[t]))):
+            actions = sorted(ready[action_type], key=lambda a: (_RISK_RANK[a.risk_level], a.requested_time))
+            for start in range(0, len(actions), self.max_batch_size):
+                calls.append(BatchCall(_PHASE_OF[action_type], action_type,
+                                       actions[start:start + self.max_batch_size]))
+
+        plan = ExecutionPlan(calls, awaiting, suppressed, self._requested, deferred)
+        self._pending = OrderedDict()
+        self._requested = 0
+        self._window_start = None
+        return plan
+
+    def approve(self, key: Tuple[str, str, str, str], now: Optional[float] = None) -> ResponseAction:
+        """
+        Approve a held action; it and the actions deferred behind it join
+        the pending window (``now`` defaults to the wall clock).
+        """
+        action = self._held.pop(key)
+        action.approved = True
+        self._requeue([action] + list(self._deferred.values()), now)
+        self._deferred.clear()
+        return action
+
+    def reject(self, key: Tuple[str, str, str, str], now: Optional[float] = None) -> List[ResponseAction]:
+        """
+        Reject a held action and drop the deferred actions that depend on it;
+        other deferred actions are re-queued. Returns the dropped actions.
+        """
+        action = self._held.pop(key)
+        dependents = set(dependent_types(action.action_type))
+        dropped = [action]
+        requeue = []
+        for deferred in self._deferred.values():
+            if deferred.scope == action.scope and deferred.action_type in dependents:
+                dropped.append(deferred)
+            else:
+                requeue.append(deferred)
+        self._deferred.clear()
+        self._requeue(requeue, now)
+        return dropped
+
+    def _requeue(self, actions: List[ResponseAction], now: Optional[float]):
+        if not actions:
+            return
+        if self._window_start is None:
+            self._window_start = time.time() if now is None else now
+        for action in actions:
+            existing = self._pending.get(action.key)
+            if existing is None:
+                self._pending[action.key] = action
+            else:
+                existing.merge(action)
+
+    def _expire(self, now: float):
+        expired = [key for key, t in self._completed.items() if now - t > self.recent_ttl]
+        for key in expired:
+            del self._completed[key]
+
+    def mark_completed(self, actions: Iterable[ResponseAction], now: float):
+        """Record completed targets so repeat requests are suppressed for ``recent_ttl``."""
+        for action in actions:
+            self._completed[action.key] = now
+
+    def execute(self, plan: ExecutionPlan, executor, now: Optional[float] = None) -> List[Dict]:
+        """
+        Run a plan's calls in order against ``executor``.
+
+        ``now`` is the planner clock in epoch seconds (default: wall clock).
+        An action whose prerequisite on the same scope did not succeed is
+        not sent and reports status ``skipped``. Returns one result per
+        planned action, in plan order, in the incident-response output
+        ``actionsExecuted`` shape; ``timestamp`` and ``completedAt`` are the
+        same completion instant on that clock.
+        """
+        results = []
+        clock = time.time() if now is None else now
+        failed = set()  # (action type, scope) that failed or were skipped
+        for call in plan.calls:
+            prerequisites = ACTION_DEPENDENCIES.get(call.action_type, ())
+            blocked = {id(a): dep for a in call.actions for dep in prerequisites
+                       if (dep, a.scope) in failed}
+            runnable = [a for a in call.actions if id(a) not in blocked]
+            elapsed_ms = 0.0
+            outcome = {}
+            if runnable:
+                call_results, elapsed_ms = executor.execute_batch(call.action_type, runnable)
+                clock += elapsed_ms / 1000.0
+                outcome = {id(a): r.get('status', 'success') for a, r in zip(runnable, call_results)}
+            completed = []
+            for action in call.actions:
+                status = outcome.get(id(action), 'skipped')
+                entry = {
+                    'actionId': action.action_id,
+                    'actionType': OUTPUT_ACTION_TYPES[action.action_type],
+                    'target': {'type': action.entity_type, 'value': action.entity_id},
+                    'status': status,
+                    'rationale': action.rationale or f"Requested by {action.request_count} alert(s)",
+                    'timestamp': datetime.fromtimestamp(clock, timezone.utc).isoformat(),
+                    'executionTimeMs': int(elapsed_ms) if status != 'skipped' else 0,
+                    'result': {'requestCount': action.request_count,
+                               'incidentIds': sorted(action.incident_ids)},
+                    'completedAt': clock,
+                }
+                if status == 'skipped':
+                    entry['errorMessage'] = (f"Prerequisite {blocked[id(action)]} did not succeed "
+                                             f"on {action.scope}")
+                results.append(entry)
+                if status == 'success':
+                    completed.append(action)
+                else:
+                    failed.add((action.action_type, action.scope))
+            self.mark_completed(completed, clock)
+        return results
+
+
+class MockExecutor:
+    """
+    Local stand-in for the containment APIs.
+
+    Each call costs ``call_latency_ms`` plus ``per_target_ms`` per target.
+    With ``sleep=False`` the latency is only reported, for virtual-clock
+    simulations; with ``sleep=True`` the executor actually waits.
+    """
+
+    def __init__(self, call_latency_ms: float = 250.0, per_target_ms: float = 5.0,
+                 sleep: bool = False):
+        self.call_latency_ms = call_latency_ms
+        self.per_target_ms = per_target_ms
+        self.sleep = sleep
+        self.calls = 0
+        self.targets = 0
+        self.elapsed_ms = 0.0
+
+    def execute_batch(self, action_type: str, actions: List[ResponseAction]) -> Tuple[List[Dict], float]:
+        """Execute one bulk call; returns (per-action results, elapsed ms)."""
+        elapsed = self.call_latency_ms + self.per_target_ms * len(actions)
+        if self.sleep:
+            time.sleep(elapsed / 1000.0)
+        self.calls += 1
+        self.targets += len(actions)
+        self.elapsed_ms += elapsed
+        return [{'status': 'success'} for _ in actions], elapsed
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Multi-tenant fair-share scheduling of alerts in front of triage.
+
+A few noisy tenants (OrgIds) can flood a shared FIFO triage queue and starve
+everyone else. ``FairShareScheduler`` keeps one queue per (priority lane,
+OrgId) and dispatches:
+
+- by priority lane, keyed on the alert's preliminary severity
+  (Critical > High > Medium > Low > Informational), with age-based
+  promotion: a lane whose oldest alert has waited ``promote_after``
+  seconds competes one lane higher, two lanes higher after twice that,
+  and so on, so lower lanes keep a share of capacity under overload;
+- within a lane, by weighted deficit round-robin (DRR) across tenants, so
+  each tenant gets service in proportion to its weight regardless of how
+  many alerts it submits;
+- subject to an optional per-tenant token bucket rate limit.
+
+Time is passed in explicitly (seconds, any monotonic origin) so the same
+scheduler runs against a wall clock or a simulated replay clock.
+"""
+
+import math
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, Iterable, List, Optional
+
+
+SEVERITY_LANES = ('Critical', 'High', 'Medium', 'Low', 'Informational')
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate`` tokens/second up to ``burst`` tokens."""
+
+    __slots__ = ('rate', 'burst', 'tokens', 'updated')
+
+    def __init__(self, rate: float, burst: float, now: float = 0.0):
+        if rate <= 0:
+            raise ValueError(f"Token bucket rate must be > 0, got {rate!r}")
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def _refill(self, now: float):
+        if now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def try_consume(self, now: float, n: float = 1.0) -> bool:
+        """Take ``n`` tokens if available."""
+        self._refill(now)
+        if self.tokens >= n:
+            self.tokens -= n
+            return True
+        return False
+
+    def next_available(self, now: float, n: float = 1.0) -> float:
+        """Earliest time at which ``n`` tokens will be available."""
+        self._refill(now)
+        if self.tokens >= n:
+            return now
+        return now + (n - self.tokens) / self.rate
+
+
+class _Lane:
+    """DRR state for one priority lane."""
+
+    __slots__ = ('queues', 'active', 'deficit', 'waiting')
+
+    def __init__(self):
+        # Tenant queues hold [submit time, alert, queued] entries; ``waiting``
+        # has the same entries in arrival order, dropped lazily once dispatched.
+        self.queues: Dict[Hashable, Deque[list]] = {}
+        self.active: Deque[Hashable] = deque()
+        self.deficit: Dict[Hashable, float] = {}
+        self.waiting: Deque[list] = deque()
+
+    def oldest(self) -> Optional[float]:
+        """Submit time of the longest-waiting queued alert."""
+        while self.waiting and not self.waiting[0][2]:
+            self.waiting.popleft()
+        return self.waiting[0][0] if self.waiting else None
+
+
+class FairShareScheduler:
+    """
+    Per-tenant weighted fair queuing with priority lanes and rate limits.
+
+    ``weights`` maps tenant -> relative share (default 1.0). ``rate_limit``
+    and ``burst`` configure a per-tenant token bucket (disabled when
+    ``rate_limit`` is None); ``rate_limits`` overrides the rate per tenant.
+    ``max_queue_depth`` bounds each tenant's backlog per lane; ``submit``
+    returns False when an alert is shed. ``promote_after`` is the wait in
+    seconds per lane of age-based promotion (None for strict priority).
+    Weights, ``quantum``, rates and ``promote_after`` must be positive;
+    ``__init__`` raises ValueError otherwise.
+    """
+
+    def __init__(self, lanes: Iterable[str] = SEVERITY_LANES, quantum: float = 1.0,
+                 weights: Optional[Dict[Hashable, float]] = None,
+                 rate_limit: Optional[float] = None, burst: float = 10.0,
+                 rate_limits: Optional[Dict[Hashable, float]] = None,
+                 max_queue_depth: Optional[int] = None,
+                 promote_after: Optional[float] = 1.0,
+                 tenant_key: Callable[[Any], Hashable] = lambda alert: alert.org_id,
+                 lane_key: Callable[[Any], str] = lambda alert: alert.severity):
+        for tenant, weight in (weights or {}).items():
+            if weight <= 0:
+                raise ValueError(f"Weight for tenant {tenant!r} must be > 0, got {weight!r}")
+        if quantum <= 0:
+            raise ValueError(f"quantum must be > 0, got {quantum!r}")
+        if rate_limit is not None and rate_limit <= 0:
+            raise ValueError(f"rate_limit must be > 0 or None, got {rate_limit!r}")
+        for tenant, rate in (rate_limits or {}).items():
+            if rate is not None and rate <= 0:
+                raise ValueError(f"Rate limit for tenant {tenant!r} must be > 0, got {rate!r}")
+        if promote_after is not None and promote_after <= 0:
+            raise ValueError(f"promote_after must be > 0 or None, got {promote_after!r}")
+        self.lanes = list(lanes)
+        self._lanes = {name: _Lane() for name in self.lanes}
+        self.quantum = quantum
+        self.weights = dict(weights or {})
+        self.rate_limit = rate_limit
+        self.burst = burst
+        self.rate_limits = dict(rate_limits or {})
+        self.max_queue_depth = max_queue_depth
+        self.promote_after = promote_after
+        self.tenant_key = tenant_key
+        self.lane_key = lane_key
+        self._buckets: Dict[Hashable, TokenBucket] = {}
+        self._size = 0
+        self.shed = 0
+
+    def __len__(self):
+        return self._size
+
+    def _bucket(self, tenant: Hashable, now: float) -> Optional[TokenBucket]:
+        rate = self.rate_limits.get(tenant, self.rate_limit)
+        if rate is None:
+            return None
+        bucket = self._buckets.get(tenant)
+        if bucket is None:
+            bucket = self._buckets[tenant] = TokenBucket(rate, self.burst, now)
+        return bucket
+
+    def submit(self, alert: Any, now: float = 0.0, tenant: Hashable = None,
+               lane: Optional[str] = None) -> bool:
+        """Enqueue ``alert``; tenant and lane default to the configured key functions."""
+        tenant = self.tenant_key(alert) if tenant is None else tenant
+        lane_name = self.lane_key(alert) if lane is None else lane
+        if lane_name not in self._lanes:
+            lane_name = self.lanes[-1]
+        state = self._lanes[lane_name]
+
+        queue = state.queues.get(tenant)
+        if queue is None:
+            queue = state.queues[tenant] = deque()
+        if self.max_queue_depth is not None and len(queue) >= self.max_queue_depth:
+            self.shed += 1
+            return False
+        if not queue:
+            state.active.append(tenant)
+            state.deficit[tenant] = 0.0
+        entry = [now, alert, True]
+        queue.append(entry)
+        state.waiting.append(entry)
+        self._size += 1
+        return True
+
+    def _dispatch_from(self, state: _Lane, now: float) -> Any:
+        """Run DRR over one lane; None if every backlogged tenant is rate limited."""
+        # A tenant with the smallest share needs ceil(1 / share) top-up visits
+        # before it can dispatch, which bounds the number of DRR rounds.
+        min_share = self.quantum * min(self.weights.values(), default=1.0)
+        rounds = math.ceil(1.0 / min(min_share, 1.0)) + 1
+        for _ in range(rounds * len(state.active)):
+            tenant = state.active[0]
+            if state.deficit[tenant] < 1.0:
+                state.deficit[tenant] += self.quantum * self.weights.get(tenant, 1.0)
+                if state.deficit[tenant] < 1.0:
+                    state.active.rotate(-1)
+                    continue
+
+            bucket = self._bucket(tenant, now)
+            if bucket is not None and not bucket.try_consume(now):
+                state.active.rotate(-1)
+                continue
+
+            queue = state.queues[tenant]
+            entry = queue.popleft()
+            entry[2] = False
+            alert = entry[1]
+            state.deficit[tenant] -= 1.0
+            self._size -= 1
+            if not queue:
+                state.active.popleft()
+                del state.queues[tenant]
+                del state.deficit[tenant]
+            elif state.deficit[tenant] < 1.0:
+                state.active.rotate(-1)
+            return alert
+        return None
+
+    def next(self, now: float = 0.0) -> Any:
+        """Dispatch the next alert, or None if nothing is eligible at ``now``."""
+        for state in self._lane_order(now):
+            alert = self._dispatch_from(state, now)
+            if alert is not None:
+                return alert
+        return None
+
+    def _lane_order(self, now: float) -> List[_Lane]:
+        """Backlogged lanes by effective priority (lane index minus promotions)."""
+        backlogged = [(rank, self._lanes[name]) for rank, name in enumerate(self.lanes)
+                      if self._lanes[name].active]
+        if self.promote_after is None or len(backlogged) < 2:
+            return [state for _, state in backlogged]
+        ranked = [(rank - int((now - state.oldest()) // self.promote_after), rank, state)
+                  for rank, state in backlogged]
+        ranked.sort(key=lambda item: item[:2])
+        return [state for _, _, state in ranked]
+
+    def drain(self, now: float = 0.0, limit: Optional[int] = None) -> List[Any]:
+        """Dispatch up to ``limit`` eligible alerts at ``now``."""
+        out = []
+        while limit is None or len(out) < limit:
+            alert = self.next(now)
+            if alert is None:
+                break
+            out.append(alert)
+        return out
+
+    def next_eligible_time(self, now: float) -> Optional[float]:
+        """Earliest time any backlogged tenant can be served (None if empty)."""
+        earliest = None
+        for state in self._lanes.values():
+            for tenant in state.active:
+                bucket = self._bucket(tenant, now)
+                t = now if bucket is None else bucket.next_available(now)
+                if earliest is None or t < earliest:
+                    earliest = t
+        return earliest
+
+    def backlog(self) -> Dict[Hashable, int]:
+        """Queued alerts per tenant across all lanes."""
+        counts: Dict[Hashable, int] = {}
+        for state in self._lanes.values():
+            for tenant, queue in state.queues.items():
+                counts[tenant] = counts.get(tenant, 0) + len(queue)
+        return counts
+
+
+class FifoScheduler:
+    """Single shared FIFO queue with the scheduler interface, as a baseline."""
+
+    def __init__(self):
+        self._queue: Deque = deque()
+        self.shed = 0
+
+    def __len__(self):
+        return len(self._queue)
+
+    def submit(self, alert: Any, now: float = 0.0, **_) -> bool:
+        self._queue.append(alert)
+        return True
+
+    def next(self, now: float = 0.0) -> Any:
+        return self._queue.popleft() if self._queue else None
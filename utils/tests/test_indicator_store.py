@@ -0,0 +1,109 @@
+"""Behaviour tests for the Bloom-filtered indicator store."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicator_store import (MISS, BloomFilter, IndicatorStore, indicator_keys,
+                             normalize_indicator)
+
+
+@pytest.fixture
+def store(tmp_path):
+    feeds = [
+        ('FileHash', np.arange(0, 20_000, 2), 'Suspicious', 'even-hashes'),
+        ('FileHash', np.array([4, 6]), 'Malicious', 'vendor'),
+        ('URL', ['HTTP://Evil.Example/Login?Next=A'], 'Malicious', 'phish'),
+        ('ThreatFamily', ['Emotet'], 'Malicious', 'families'),
+    ]
+    IndicatorStore.build(tmp_path, feeds, fp_rate=0.01)
+    return IndicatorStore.open(tmp_path)
+
+
+def labels(store, codes):
+    return [None if code == MISS else store.label_table[code] for code in codes]
+
+
+def test_exact_lookup_has_no_false_positives_or_negatives(store):
+    probe = np.arange(20_000)
+
+    hits = store.contains('FileHash', probe)
+
+    assert np.array_equal(hits, probe % 2 == 0)
+
+
+def test_bloom_prefilter_does_not_change_results(store):
+    probe = np.arange(-1_000, 25_000)
+    with_bloom = store.lookup('FileHash', probe)
+    store.use_bloom = False
+
+    assert np.array_equal(store.lookup('FileHash', probe), with_bloom)
+
+
+def test_duplicate_indicator_keeps_most_severe_reputation(store):
+    codes = store.lookup('FileHash', np.array([2, 4]))
+
+    assert labels(store, codes) == [('Suspicious', 'even-hashes'), ('Malicious', 'vendor')]
+
+
+def test_ioc_type_is_part_of_the_key(store):
+    assert not store.contains('IP', np.array([2, 4])).any()
+
+
+def test_nulls_and_fractional_floats_never_match(store):
+    values = np.array([2.0, 2.5, np.nan, 4.0])
+
+    assert store.contains('FileHash', values).tolist() == [True, False, False, True]
+    _, valid = indicator_keys('FileHash', values)
+    assert valid.tolist() == [True, False, False, True]
+
+
+def test_digit_strings_match_integer_ids(store):
+    assert store.contains('FileHash', np.array(['2', ' 4 ', '5', None], dtype=object)).tolist() == \
+        [True, True, False, False]
+
+
+@pytest.mark.parametrize('ioc_type, raw, expected', [
+    ('URL', 'HTTPS://Host.Example:8443/Path?Q=A#Frag', 'https://host.example:8443/Path?Q=A#Frag'),
+    ('URL', 'Host.Example/Path', 'host.example/Path'),
+    ('URL', 'http://User@Host.Example/', 'http://User@host.example/'),
+    ('FileHash', ' ABCDEF0123 ', 'abcdef0123'),
+    ('FileHash', 'Invoice.PDF', 'Invoice.PDF'),
+    ('Domain', 'Evil.Example', 'evil.example'),
+    ('ThreatFamily', 'Emotet', 'emotet'),
+])
+def test_normalization_is_case_aware_per_type(ioc_type, raw, expected):
+    assert normalize_indicator(ioc_type, raw) == expected
+
+
+def test_url_lookup_ignores_host_case_only(store):
+    urls = ['http://evil.example/Login?Next=A', 'http://EVIL.example/Login?Next=A',
+            'http://evil.example/login?next=a']
+
+    assert store.contains('URL', np.array(urls, dtype=object)).tolist() == [True, True, False]
+
+
+def test_bloom_filter_has_no_false_negatives_and_bounded_false_positives():
+    rng = np.random.default_rng(0)
+    members = rng.integers(0, 2**63, 50_000, dtype=np.uint64)
+    others = rng.integers(0, 2**63, 50_000, dtype=np.uint64)
+    bloom = BloomFilter.for_capacity(len(members), fp_rate=0.01)
+    bloom.add(members)
+
+    assert bloom.might_contain(members).all()
+    assert bloom.might_contain(others).mean() < 0.02
+
+
+def test_enrich_frame_reports_matches_per_alert(store):
+    df = pd.DataFrame({
+        'Sha256': [4.0, 3.0, np.nan],
+        'Url': [None, None, 'http://evil.example/Login?Next=A'],
+        'ThreatFamily': ['EMOTET', None, None],
+    })
+
+    enriched = store.enrich_frame(df)
+
+    assert enriched['ThreatIntelHits'].tolist() == [2, 0, 1]
+    assert enriched['ThreatIntelMatches'][1] is None
+    assert {m['IOCType'] for m in enriched['ThreatIntelMatches'][0]} == {'FileHash', 'ThreatFamily'}
+    assert enriched['ThreatIntelMatches'][0][0]['IOC'] == '4'
@@ -0,0 +1,153 @@
+"""Behaviour tests for response-action deduplication and dependency planning."""
+
+import pytest
+
+from response_planner import (MockExecutor, ResponseAction, ResponsePlanner, action_phases,
+                              dependent_types)
+
+
+class FailingExecutor(MockExecutor):
+    """Mock executor that fails every action against the given entity IDs."""
+
+    def __init__(self, failing=()):
+        super().__init__()
+        self.failing = set(failing)
+        self.sent = []
+
+    def execute_batch(self, action_type, actions):
+        _, elapsed = super().execute_batch(action_type, actions)
+        self.sent.extend((action_type, a.entity_id) for a in actions)
+        return [{'status': 'failed' if a.entity_id in self.failing else 'success'}
+                for a in actions], elapsed
+
+
+def isolate(host, **kwargs):
+    return ResponseAction('IsolateEndpoint', 'Host', host, **kwargs)
+
+
+def terminate(process, host, **kwargs):
+    return ResponseAction('TerminateProcess', 'Process', process, scope=host, **kwargs)
+
+
+def quarantine(file, host, **kwargs):
+    return ResponseAction('QuarantineFile', 'File', file, scope=host, **kwargs)
+
+
+def test_duplicates_merge_into_one_action():
+    planner = ResponsePlanner()
+    planner.submit(isolate('h1', risk_level='Medium', incident_id='i1', alert_id='a1'), 0.0)
+    planner.submit(isolate('h1', risk_level='Critical', incident_id='i2', alert_id='a2'), 0.5)
+
+    plan = planner.plan(2.0)
+
+    [call] = plan.calls
+    [action] = call.actions
+    assert plan.requested == 2 and plan.unique_actions == 1
+    assert action.risk_level == 'Critical'
+    assert action.incident_ids == {'i1', 'i2'} and action.request_count == 2
+
+
+def test_same_process_on_different_hosts_is_not_merged():
+    planner = ResponsePlanner()
+    planner.submit(terminate('evil.exe', 'h1'), 0.0)
+    planner.submit(terminate('evil.exe', 'h2'), 0.0)
+
+    assert planner.plan(2.0).unique_actions == 2
+
+
+def test_recently_completed_actions_are_suppressed_until_ttl():
+    planner = ResponsePlanner(recent_ttl=60.0)
+    planner.submit(isolate('h1'), 0.0)
+    planner.execute(planner.plan(2.0), MockExecutor(), now=2.0)
+
+    planner.submit(isolate('h1'), 10.0)
+    assert len(planner.plan(12.0).suppressed) == 1
+    planner.submit(isolate('h1'), 100.0)
+    assert planner.plan(102.0).unique_actions == 1
+
+
+def test_calls_follow_dependency_phases_and_batch_size():
+    planner = ResponsePlanner(max_batch_size=2)
+    for i in range(3):
+        planner.submit(quarantine(f'f{i}', 'h1'), 0.0)
+    planner.submit(terminate('p', 'h1'), 0.0)
+    planner.submit(isolate('h1'), 0.0)
+
+    plan = planner.plan(2.0)
+
+    assert [(c.action_type, len(c)) for c in plan.calls] == [
+        ('IsolateEndpoint', 1), ('TerminateProcess', 1), ('QuarantineFile', 2), ('QuarantineFile', 1)]
+    assert action_phases()[0][0] == 'IsolateEndpoint'
+    assert set(dependent_types('IsolateEndpoint')) == {'TerminateProcess', 'QuarantineFile'}
+
+
+def test_dependents_of_a_failed_prerequisite_are_skipped_on_that_scope_only():
+    planner = ResponsePlanner()
+    for host in ('h1', 'h2'):
+        planner.submit(isolate(host), 0.0)
+        planner.submit(terminate('evil.exe', host), 0.0)
+        planner.submit(quarantine('bad.dll', host), 0.0)
+    executor = FailingExecutor(failing={'h1'})
+
+    results = planner.execute(planner.plan(2.0), executor, now=2.0)
+
+    assert [r['status'] for r in results if r['status'] != 'success'] == ['failed', 'skipped', 'skipped']
+    assert ('TerminateProcess', 'evil.exe') in executor.sent
+    assert executor.targets == 4  # both isolations, h2's terminate and quarantine
+    skipped = [r for r in results if r['status'] == 'skipped']
+    assert all('on h1' in r['errorMessage'] and r['executionTimeMs'] == 0 for r in skipped)
+
+    # Skipped actions are not recorded as completed, so a retry is planned
+    planner.submit(terminate('evil.exe', 'h1'), 5.0)
+    assert planner.plan(7.0).unique_actions == 1
+
+
+def test_held_action_absorbs_later_duplicates():
+    planner = ResponsePlanner()
+    planner.submit(isolate('h1', requires_approval=True, incident_id='i1'), 0.0)
+    first = planner.plan(2.0)
+
+    planner.submit(isolate('h1', incident_id='i2'), 3.0)
+    second = planner.plan(5.0)
+
+    assert len(first.awaiting_approval) == 1
+    assert not second.awaiting_approval and not second.calls
+    [held] = planner.awaiting_approval()
+    assert held.incident_ids == {'i1', 'i2'} and held.request_count == 2
+    assert held.to_dict()['Status'] == 'ApprovalRequired'
+
+
+def test_dependents_wait_for_approval_and_run_after_it():
+    planner = ResponsePlanner()
+    planner.submit(isolate('h1', requires_approval=True), 0.0)
+    planner.submit(terminate('evil.exe', 'h1'), 0.0)
+    planner.submit(terminate('evil.exe', 'h2'), 0.0)
+
+    plan = planner.plan(2.0)
+    assert [a.scope for a in plan.deferred] == ['h1']
+    assert [a.scope for call in plan.calls for a in call.actions] == ['h2']
+
+    approved = planner.approve(isolate('h1').key, now=10.0)
+    assert approved.to_dict()['Status'] == 'Approved'
+    plan = planner.plan(12.0)
+    assert [(c.action_type, c.actions[0].entity_id) for c in plan.calls] == [
+        ('IsolateEndpoint', 'h1'), ('TerminateProcess', 'evil.exe')]
+    assert not planner.awaiting_approval()
+
+
+def test_rejection_drops_deferred_dependents():
+    planner = ResponsePlanner()
+    planner.submit(isolate('h1', requires_approval=True), 0.0)
+    planner.submit(terminate('evil.exe', 'h1'), 0.0)
+    planner.submit(quarantine('bad.dll', 'h1'), 0.0)
+    planner.plan(2.0)
+
+    dropped = planner.reject(isolate('h1').key, now=10.0)
+
+    assert [a.action_type for a in dropped] == ['IsolateEndpoint', 'TerminateProcess', 'QuarantineFile']
+    assert len(planner) == 0 and not planner.awaiting_approval()
+
+
+def test_unknown_action_type_is_rejected():
+    with pytest.raises(ValueError):
+        ResponseAction('Reboot', 'Host', 'h1')
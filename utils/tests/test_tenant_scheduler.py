@@ -0,0 +1,109 @@
+"""Behaviour tests for the fair-share alert scheduler."""
+
+from collections import Counter
+
+import pytest
+
+from tenant_scheduler import FairShareScheduler, FifoScheduler, TokenBucket
+
+
+def submit_all(scheduler, tenant, n, lane='Medium', now=0.0):
+    for i in range(n):
+        scheduler.submit((tenant, i), now, tenant=tenant, lane=lane)
+
+
+def test_drr_serves_tenants_in_proportion_to_weight():
+    scheduler = FairShareScheduler(weights={'a': 2.0, 'b': 1.0})
+    submit_all(scheduler, 'a', 60)
+    submit_all(scheduler, 'b', 60)
+
+    served = Counter(tenant for tenant, _ in scheduler.drain(limit=30))
+
+    assert served == {'a': 20, 'b': 10}
+
+
+def test_light_tenant_is_not_stuck_behind_a_flood():
+    scheduler = FairShareScheduler()
+    submit_all(scheduler, 'heavy', 1000)
+    submit_all(scheduler, 'light', 5)
+
+    first = [tenant for tenant, _ in scheduler.drain(limit=10)]
+
+    assert first.count('light') == 5
+    assert scheduler.backlog() == {'heavy': 995}
+
+
+def test_fifo_baseline_keeps_arrival_order():
+    scheduler = FifoScheduler()
+    submit_all(scheduler, 'heavy', 3)
+    submit_all(scheduler, 'light', 1)
+
+    assert [scheduler.next()[0] for _ in range(4)] == ['heavy'] * 3 + ['light']
+
+
+def test_token_bucket_refills_at_rate_up_to_burst():
+    bucket = TokenBucket(rate=2.0, burst=3.0)
+
+    assert [bucket.try_consume(0.0) for _ in range(4)] == [True, True, True, False]
+    assert bucket.next_available(0.0) == pytest.approx(0.5)
+    assert bucket.try_consume(0.5)
+    assert not bucket.try_consume(0.5)
+    bucket.try_consume(100.0)
+    assert bucket.tokens == pytest.approx(2.0)
+
+
+def test_rate_limited_tenant_yields_to_others():
+    scheduler = FairShareScheduler(rate_limit=1.0, burst=1.0, rate_limits={'b': 100.0})
+    submit_all(scheduler, 'a', 5)
+    submit_all(scheduler, 'b', 5)
+
+    assert sorted(tenant for tenant, _ in scheduler.drain(now=0.0)) == ['a', 'b']
+    assert scheduler.next_eligible_time(0.0) == pytest.approx(0.01)
+    served = [tenant for tenant, _ in scheduler.drain(now=0.5)]
+    assert served == ['b']
+    assert [tenant for tenant, _ in scheduler.drain(now=1.0)] == ['a', 'b']
+
+
+def test_higher_lane_goes_first_while_nothing_has_aged():
+    scheduler = FairShareScheduler()
+    scheduler.submit('info', 0.0, tenant='t', lane='Informational')
+    scheduler.submit('high', 0.0, tenant='t', lane='High')
+
+    assert scheduler.next(0.5) == 'high'
+
+
+@pytest.mark.parametrize('promote_after, expected', [(1.0, 'info'), (None, 'high')])
+def test_old_alerts_are_promoted_past_fresh_higher_lanes(promote_after, expected):
+    scheduler = FairShareScheduler(promote_after=promote_after)
+    scheduler.submit('info', 0.0, tenant='t', lane='Informational')
+    # Informational is four lanes below Critical; after 4s it outranks fresh High
+    scheduler.submit('high', 4.0, tenant='t', lane='High')
+
+    assert scheduler.next(4.0) == expected
+
+
+def test_unknown_lane_falls_back_to_lowest():
+    scheduler = FairShareScheduler(promote_after=None)
+    scheduler.submit('odd', 0.0, tenant='t', lane='Bogus')
+    scheduler.submit('low', 0.0, tenant='t', lane='Low')
+
+    assert scheduler.drain() == ['low', 'odd']
+
+
+def test_queue_depth_sheds_excess_alerts():
+    scheduler = FairShareScheduler(max_queue_depth=2)
+
+    accepted = [scheduler.submit(i, tenant='t', lane='High') for i in range(4)]
+
+    assert accepted == [True, True, False, False]
+    assert scheduler.shed == 2
+    assert len(scheduler) == 2
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'weights': {'a': 0}}, {'quantum': 0}, {'rate_limit': -1},
+    {'rate_limits': {'a': 0}}, {'promote_after': 0},
+])
+def test_rejects_non_positive_settings(kwargs):
+    with pytest.raises(ValueError):
+        FairShareScheduler(**kwargs)
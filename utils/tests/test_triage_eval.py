@@ -0,0 +1,85 @@
+"""Behaviour tests for the incident-level chronological split."""
+
+import numpy as np
+import pytest
+
+from triage_eval import chronological_split
+
+
+def make_columns(n_orgs=4, incidents_per_org=10, alerts_per_incident=3, seed=0):
+    """Alerts of ``n_orgs`` tenants; incident i of an org starts at second i * 100."""
+    rng = np.random.default_rng(seed)
+    org, incident, timestamp = [], [], []
+    for o in range(n_orgs):
+        for i in range(incidents_per_org):
+            for a in range(alerts_per_incident):
+                org.append(o)
+                incident.append(o * 1000 + i)
+                timestamp.append(i * 100 + a)
+    order = rng.permutation(len(org))
+    return {'OrgId': np.array(org)[order], 'IncidentId': np.array(incident)[order],
+            'Timestamp': np.array(timestamp, dtype=np.int64)[order]}
+
+
+def incidents(columns, mask):
+    return set(columns['IncidentId'][mask].tolist())
+
+
+@pytest.mark.parametrize('mode', ['per-org', 'global'])
+def test_alerts_of_one_incident_stay_together(mode):
+    columns = make_columns()
+
+    test = chronological_split(columns, 0.3, mode=mode)
+
+    assert not incidents(columns, test) & incidents(columns, ~test)
+
+
+def test_per_org_split_holds_out_each_orgs_latest_incidents():
+    columns = make_columns()
+
+    test = chronological_split(columns, 0.2, mode='per-org')
+
+    assert incidents(columns, test) == {o * 1000 + i for o in range(4) for i in (8, 9)}
+
+
+def test_every_test_incident_is_later_than_its_orgs_train_incidents():
+    columns = make_columns(seed=3)
+    test = chronological_split(columns, 0.5)
+
+    for org in range(4):
+        in_org = columns['OrgId'] == org
+        assert columns['Timestamp'][in_org & test].min() > columns['Timestamp'][in_org & ~test].max()
+
+
+def test_global_split_uses_one_cutoff_across_orgs():
+    columns = make_columns()
+    # Org 0's incidents all start after every other org's
+    columns['Timestamp'] = columns['Timestamp'] + np.where(columns['OrgId'] == 0, 10_000, 0)
+
+    test = chronological_split(columns, 0.25, mode='global')
+
+    assert incidents(columns, test) == {i for i in range(10)}
+
+
+def test_holdout_orgs_move_whole_tenants_to_test():
+    columns = make_columns(n_orgs=10)
+
+    test = chronological_split(columns, 0.2, holdout_org_fraction=0.2, seed=1)
+
+    held_out = [org for org in range(10) if test[columns['OrgId'] == org].all()]
+    assert len(held_out) == 2
+    assert test.sum() == 3 * (2 * 10 + 8 * 2)
+    assert np.array_equal(test, chronological_split(columns, 0.2, holdout_org_fraction=0.2, seed=1))
+
+
+def test_zero_test_fraction_holds_nothing_out():
+    assert not chronological_split(make_columns(), 0.0).any()
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'test_fraction': 1.0}, {'test_fraction': -0.1}, {'test_fraction': float('nan')},
+    {'holdout_org_fraction': 1.0}, {'holdout_org_fraction': -0.5}, {'mode': 'random'},
+])
+def test_rejects_invalid_arguments(kwargs):
+    with pytest.raises(ValueError):
+        chronological_split(make_columns(), **kwargs)